@@ -0,0 +1,125 @@
+"""
+Serialization and hydration of a wide representative document:
+* model_dump(by_alias=True, exclude_none=True) vs the compiled serializer called directly (DBModel.to_bson);
+* model_validate vs the compiled validator called directly (DBModel.from_bson) vs model_construct.
+
+Plain pydantic models with the same fields are used, so that the benchmark runs without a database.
+
+Usage: python -m benchmarks.bench_dbmodel_serialization [--rounds N]
+"""
+import argparse
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+from uuid import UUID, uuid4
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+
+class Status(str, Enum):
+    ACTIVE = "active"
+    BLOCKED = "blocked"
+
+
+class Address(BaseModel):
+    country: str
+    city: str
+    street: str | None = None
+    building: int | None = None
+
+
+class Contact(BaseModel):
+    kind: str
+    value: str
+    is_verified: bool = False
+
+
+class Profile(BaseModel):
+    id: PydanticObjectId | None = Field(default=None, alias="_id")
+    user_id: UUID
+    login: str
+    email: str
+    first_name: str
+    last_name: str
+    middle_name: str | None = None
+    status: Status
+    rating: float
+    level: int
+    balance: int
+    created_at: datetime
+    updated_at: datetime
+    last_seen_at: datetime | None = None
+    is_verified: bool
+    is_deleted: bool = False
+    locale: str
+    timezone: str
+    referrer_id: UUID | None = None
+    address: Address
+    contacts: list[Contact]
+    tags: list[str]
+    settings: dict[str, Any]
+
+
+def make_profile() -> Profile:
+    now = datetime.now(timezone.utc)
+    return Profile(
+        _id=PydanticObjectId(),
+        user_id=uuid4(),
+        login="user",
+        email="user@example.com",
+        first_name="First",
+        last_name="Last",
+        status=Status.ACTIVE,
+        rating=4.5,
+        level=10,
+        balance=1000,
+        created_at=now,
+        updated_at=now,
+        is_verified=True,
+        locale="en",
+        timezone="UTC",
+        address=Address(country="US", city="Boston", street="Main"),
+        contacts=[Contact(kind="phone", value="+100000000"), Contact(kind="email", value="user@example.com")],
+        tags=["a", "b", "c"],
+        settings={"notifications": True, "theme": "dark"},
+    )
+
+
+def run(func: Callable[[], Any], rounds: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        func()
+
+    return rounds / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=50_000)
+    args = parser.parse_args()
+
+    profile = make_profile()
+    data = profile.model_dump(by_alias=True, exclude_none=True)
+    serializer = Profile.__pydantic_serializer__
+    validator = Profile.__pydantic_validator__
+    assert serializer.to_python(profile, by_alias=True, exclude_none=True) == data
+    assert validator.validate_python(data) == profile
+
+    options = {"by_alias": True, "exclude_none": True}
+    results = {
+        "model_dump": run(lambda: profile.model_dump(**options), args.rounds),
+        "compiled serializer": run(lambda: serializer.to_python(profile, **options), args.rounds),
+        "model_validate": run(lambda: Profile.model_validate(data), args.rounds),
+        "compiled validator": run(lambda: validator.validate_python(data), args.rounds),
+        # Nested models stay dicts, shown for reference only
+        "model_construct": run(lambda: Profile.model_construct(**data), args.rounds),
+    }
+    for name, docs_per_sec in results.items():
+        print(f"{name:<20} {docs_per_sec:>12,.0f} docs/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cost of log calls below the logger level, e.g. logger.debug(...) in hot loops with log_level=INFO:
+the level-filtering logger returned by get_logger vs the stdlib bound logger with stdlib level check.
+"early" loggers are created before setup_logging, like module-level `logger = get_logger(__name__)`.
+
+Usage: python -m benchmarks.bench_disabled_levels [--calls N]
+"""
+import argparse
+import io
+import sys
+import time
+from collections.abc import Callable
+
+import structlog
+
+from boilerplates.logging import LogFormat, LoggingConfig, get_logger, setup_logging
+
+
+def run(call: Callable[[int], None], calls: int) -> float:
+    started_at = time.perf_counter()
+    for index in range(calls):
+        call(index)
+
+    return (time.perf_counter() - started_at) / calls * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    early = get_logger("bench.early")
+    early_enabled = get_logger("bench.verbose.early")
+    stdout, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        setup_logging(
+            config=LoggingConfig(
+                use_colors=False,
+                log_format=LogFormat.JSON,
+                log_level="INFO",
+                is_sentry_enabled=False,
+                log_levels={"bench.verbose": "DEBUG"},
+            ),
+        )
+        filtering = get_logger("bench.loop")
+        # The previous behaviour: every call goes through the generic bound logger down to the stdlib level check
+        generic = structlog.wrap_logger(
+            None,
+            wrapper_class=structlog.make_filtering_bound_logger(0),
+            logger_factory_args=("bench.loop",),
+        )
+        enabled = get_logger("bench.verbose.loop")
+
+        results = {
+            "generic debug": run(lambda index: generic.debug("iteration done", index=index), args.calls),
+            "filtering debug": run(lambda index: filtering.debug("iteration done", index=index), args.calls),
+            "filtering debug f-string": run(lambda index: filtering.debug(f"iteration {index} done"), args.calls),
+            "early filtering debug": run(lambda index: early.debug("iteration done", index=index), args.calls),
+            "enabled debug (reference)": run(
+                lambda index: enabled.debug("iteration done", index=index),
+                args.calls // 20,
+            ),
+            "early enabled debug": run(
+                lambda index: early_enabled.debug("iteration done", index=index),
+                args.calls // 20,
+            ),
+        }
+    finally:
+        sys.stdout = stdout
+
+    for name, ns in results.items():
+        print(f"{name:<28} {ns:>8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Events/sec of setup_logging for every LogFormat, output goes to /dev/null.
+
+Usage: python -m benchmarks.bench_log_formats [--events N]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from boilerplates.logging import LogFormat, LoggingConfig, get_logger, setup_logging
+
+
+def run(log_format: LogFormat, events: int) -> float:
+    setup_logging(
+        config=LoggingConfig(
+            use_colors=False,
+            log_format=log_format,
+            log_level=logging.DEBUG,
+            is_sentry_enabled=False,
+        ),
+    )
+    logger = get_logger("bench")
+    request_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    started_at = time.perf_counter()
+    for index in range(events):
+        logger.info("request handled", index=index, request_id=request_id, created_at=now, path="/api/v1/items")
+
+    return events / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=50_000)
+    args = parser.parse_args()
+
+    stdout = sys.stdout
+    results = {}
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        sys.stdout = devnull
+        try:
+            for log_format in LogFormat:
+                results[log_format] = run(log_format, args.events)
+        finally:
+            sys.stdout = stdout
+
+    for log_format, events_per_sec in results.items():
+        print(f"{log_format.value:<10} {events_per_sec:>12,.0f} events/sec")
+
+
+if __name__ == "__main__":
+    main()
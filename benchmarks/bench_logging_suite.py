@@ -0,0 +1,311 @@
+"""
+Benchmark suite of boilerplates.logging: setup_logging with every LogFormat, with and without Sentry
+and file logging, writing stdout to /dev/null and to a slow pipe.
+
+For every scenario reports:
+* events/sec of a tight logging loop;
+* p50 and p99 latency of a single call;
+* peak bytes allocated per call (tracemalloc, separate pass);
+* p99 and max event loop lag while concurrent asyncio tasks are logging.
+
+The report is a markdown table, --output additionally writes it as JSON with sorted keys and rounded numbers,
+so reports of different versions can be checked in and diffed. --baseline adds the change against a previous report.
+
+Usage: python -m benchmarks.bench_logging_suite [--events N] [--output report.json] [--baseline old.json]
+"""
+import argparse
+import asyncio
+import importlib.metadata
+import io
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TextIO
+from uuid import uuid4
+
+from boilerplates.logging import (
+    FileLoggingConfig,
+    LogFormat,
+    LoggingConfig,
+    get_logger,
+    setup_logging,
+    shutdown_logging,
+)
+
+LOGGER_NAME = "bench"
+SINKS = ("devnull", "slow_pipe")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    log_format: LogFormat
+    sentry: bool
+    file_logging: bool
+    sink: str
+
+    @property
+    def key(self) -> str:
+        return (
+            f"{self.log_format.value}/sentry={'on' if self.sentry else 'off'}"
+            f"/files={'on' if self.file_logging else 'off'}/{self.sink}"
+        )
+
+
+@dataclass
+class ScenarioResult:
+    events_per_sec: float
+    p50_us: float
+    p99_us: float
+    alloc_bytes_per_event: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+
+
+def _round(value: float) -> float:
+    """Three significant digits, so that the report does not change on noise-level differences"""
+    return float(f"{value:.3g}")
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class SlowPipe:
+    """Pipe whose reader consumes read_size bytes every read_delay seconds, so writers block when it is full"""
+
+    def __init__(self, read_size: int, read_delay: float) -> None:
+        self._read_fd, write_fd = os.pipe()
+        self._read_size = read_size
+        self._read_delay = read_delay
+        self.stream: TextIO = io.TextIOWrapper(io.FileIO(write_fd, "w"), encoding="utf-8")
+        self._reader = threading.Thread(target=self._read, name="slow-pipe-reader", daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        while os.read(self._read_fd, self._read_size):
+            time.sleep(self._read_delay)
+
+        os.close(self._read_fd)
+
+    def close(self) -> None:
+        self.stream.close()
+        self._reader.join()
+
+
+@contextmanager
+def _redirect_stdout(sink: str, args: argparse.Namespace) -> Iterator[None]:
+    stdout = sys.stdout
+    if sink == "devnull":
+        stream: Any = open(os.devnull, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+        close = stream.close
+    else:
+        pipe = SlowPipe(read_size=args.pipe_read_size, read_delay=args.pipe_read_delay)
+        stream, close = pipe.stream, pipe.close
+
+    sys.stdout = stream
+    try:
+        yield
+    finally:
+        shutdown_logging()
+        logging.getLogger().handlers = []
+        sys.stdout = stdout
+        close()
+
+
+def _setup(scenario: Scenario, logs_folder: Path) -> Any:
+    file_logging = None
+    if scenario.file_logging:
+        file_logging = FileLoggingConfig(clean_dir_on_setup=True, logs_folder=logs_folder, logger_names=[LOGGER_NAME])
+
+    setup_logging(
+        config=LoggingConfig(
+            use_colors=False,
+            log_format=scenario.log_format,
+            log_level=logging.INFO,
+            is_sentry_enabled=scenario.sentry,
+            file_logging=file_logging,
+        ),
+    )
+    return get_logger(LOGGER_NAME)
+
+
+def _log_call(logger: Any) -> Any:
+    request_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    def call(index: int) -> None:
+        logger.info("request handled", index=index, request_id=request_id, created_at=now, path="/api/v1/items")
+
+    return call
+
+
+def _measure_throughput(logger: Any, events: int) -> tuple[float, float, float]:
+    call = _log_call(logger)
+    latencies = []
+    perf_counter_ns = time.perf_counter_ns
+    started_at = time.perf_counter()
+    for index in range(events):
+        call_started_at = perf_counter_ns()
+        call(index)
+        latencies.append(perf_counter_ns() - call_started_at)
+
+    events_per_sec = events / (time.perf_counter() - started_at)
+    return events_per_sec, _percentile(latencies, 50) / 1000, _percentile(latencies, 99) / 1000
+
+
+def _measure_allocations(logger: Any, events: int) -> float:
+    call = _log_call(logger)
+    call(-1)  # warm up caches, so that one-off allocations are not counted
+    total = 0
+    tracemalloc.start()
+    try:
+        for index in range(events):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call(index)
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return total / events
+
+
+async def _measure_loop_lag(logger: Any, tasks: int, events_per_task: int, interval: float) -> tuple[float, float]:
+    call = _log_call(logger)
+    lags: list[float] = []
+    is_running = True
+
+    async def monitor() -> None:
+        while is_running:
+            expected_at = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, time.perf_counter() - expected_at) * 1000)
+
+    async def worker() -> None:
+        for index in range(events_per_task):
+            call(index)
+            await asyncio.sleep(0)
+
+    monitor_task = asyncio.create_task(monitor())
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    is_running = False
+    await monitor_task
+
+    return _percentile(lags, 99), max(lags)
+
+
+def run_scenario(scenario: Scenario, args: argparse.Namespace, logs_folder: Path) -> ScenarioResult:
+    with _redirect_stdout(scenario.sink, args):
+        logger = _setup(scenario, logs_folder)
+        events_per_sec, p50_us, p99_us = _measure_throughput(logger, args.events)
+        alloc_bytes_per_event = _measure_allocations(logger, args.alloc_events)
+        loop_lag_p99_ms, loop_lag_max_ms = asyncio.run(
+            _measure_loop_lag(logger, args.tasks, args.events // args.tasks, args.lag_interval),
+        )
+
+    return ScenarioResult(
+        events_per_sec=_round(events_per_sec),
+        p50_us=_round(p50_us),
+        p99_us=_round(p99_us),
+        alloc_bytes_per_event=_round(alloc_bytes_per_event),
+        loop_lag_p99_ms=_round(loop_lag_p99_ms),
+        loop_lag_max_ms=_round(loop_lag_max_ms),
+    )
+
+
+def _init_sentry() -> bool:
+    try:
+        import sentry_sdk
+        from sentry_sdk.transport import Transport
+    except ImportError:
+        return False
+
+    class NullTransport(Transport):
+        def capture_envelope(self, envelope: Any) -> None:
+            ...
+
+    sentry_sdk.init(dsn="http://key@localhost/1", transport=NullTransport, default_integrations=False)
+    return True
+
+
+def _render_table(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]) -> str:
+    columns = list(ScenarioResult.__dataclass_fields__)
+    lines = [
+        "| scenario | " + " | ".join(columns) + " |",
+        "|---" * (len(columns) + 1) + "|",
+    ]
+    for key, result in results.items():
+        cells = []
+        for column in columns:
+            cell = f"{result[column]:g}"
+            if (previous := baseline.get(key, {}).get(column)) is not None and previous:
+                cell += f" ({(result[column] - previous) / previous:+.0%})"
+
+            cells.append(cell)
+
+        lines.append(f"| {key} | " + " | ".join(cells) + " |")
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20_000, help="events per throughput and loop lag pass")
+    parser.add_argument("--alloc-events", type=int, default=2_000, help="events of the tracemalloc pass")
+    parser.add_argument("--tasks", type=int, default=10, help="concurrent asyncio tasks of the loop lag pass")
+    parser.add_argument("--lag-interval", type=float, default=0.001, help="loop lag probe interval in seconds")
+    parser.add_argument("--pipe-read-size", type=int, default=4096)
+    parser.add_argument("--pipe-read-delay", type=float, default=0.001)
+    parser.add_argument("--formats", nargs="*", default=[log_format.value for log_format in LogFormat])
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON report of a previous run to compare with")
+    args = parser.parse_args()
+
+    sentry_options = (False, True) if _init_sentry() else (False,)
+    scenarios = [
+        Scenario(LogFormat(log_format), sentry, file_logging, sink)
+        for log_format, sentry, file_logging, sink in itertools.product(
+            args.formats,
+            sentry_options,
+            (False, True),
+            SINKS,
+        )
+    ]
+
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as logs_folder:
+        for scenario in scenarios:
+            results[scenario.key] = asdict(run_scenario(scenario, args, Path(logs_folder)))
+            print(f"done: {scenario.key}", file=sys.stderr)
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else {}
+    print(_render_table(results, baseline))
+
+    if args.output:
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "structlog": importlib.metadata.version("structlog"),
+                "events": args.events,
+                "tasks": args.tasks,
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+if __name__ == "__main__":
+    main()
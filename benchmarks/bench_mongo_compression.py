@@ -0,0 +1,116 @@
+"""
+Wire compression trade-offs: for no compression and every compressor, N representative documents are inserted
+in batches and read back. The wall time, the client CPU time and the traffic counted by the server
+(serverStatus network.bytesIn / bytesOut, so the database should not serve other clients meanwhile) are printed.
+
+Compressors whose client packages are not installed (python-snappy, zstandard) are skipped.
+A running mongod is required, the bench_mongo_compression database is dropped.
+
+Usage: python -m benchmarks.bench_mongo_compression [--url mongodb://localhost:27017] [--documents N]
+"""
+import argparse
+import asyncio
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+from pymongo.compression_support import validate_compressors
+
+from boilerplates.logging import get_logger
+from boilerplates.mongodb import Compressor, MongoConfig, MongoDBWrapper
+
+DB_NAME = "bench_mongo_compression"
+
+
+def make_document(index: int) -> dict[str, Any]:
+    return {
+        "user_id": uuid4(),
+        "login": f"user_{index}",
+        "email": f"user_{index}@example.com",
+        "status": "active" if index % 10 else "blocked",
+        "created_at": datetime.now(timezone.utc),
+        "rating": index % 50 / 10,
+        "address": {"country": "US", "city": "Boston", "street": "Main street", "building": index % 300},
+        "tags": ["customer", "newsletter", "mobile"],
+        "comment": "Regular customer, prefers delivery in the evening. " * 3,
+    }
+
+
+def make_config(url: str, compressors: list[Compressor]) -> MongoConfig:
+    parts = urlsplit(url)
+    return MongoConfig(
+        host=parts.netloc.rpartition("@")[2],
+        db_name=DB_NAME,
+        user=parts.username or "",
+        password=parts.password or "",
+        timeout_ms=30_000,
+        min_connections_count=0,
+        max_connections_count=10,
+        compressors=compressors,
+    )
+
+
+def is_available(compressor: Compressor) -> bool:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return bool(validate_compressors(None, [compressor.value]))
+
+
+async def network_bytes(mongo: MongoDBWrapper) -> tuple[int, int]:
+    network = (await mongo.client.admin.command("serverStatus"))["network"]
+    return network["bytesIn"], network["bytesOut"]
+
+
+async def run(url: str, compressors: list[Compressor], documents: list[dict[str, Any]], batch_size: int) -> None:
+    mongo = MongoDBWrapper(get_logger("bench"), make_config(url, compressors))
+    collection = mongo.get_db()["documents"]
+    await collection.drop()
+    bytes_in, bytes_out = await network_bytes(mongo)
+    started_at, cpu_started_at = time.perf_counter(), time.process_time()
+
+    for start in range(0, len(documents), batch_size):
+        # insert_many adds _id to the documents, copies keep the input the same for every compressor
+        await collection.insert_many([dict(document) for document in documents[start:start + batch_size]])
+
+    insert_duration = time.perf_counter() - started_at
+    read_started_at = time.perf_counter()
+    read = len(await collection.find({}, batch_size=batch_size).to_list(None))
+    read_duration = time.perf_counter() - read_started_at
+    cpu_duration = time.process_time() - cpu_started_at
+
+    new_bytes_in, new_bytes_out = await network_bytes(mongo)
+    mongo.client.close()
+    assert read == len(documents)
+    name = ",".join(compressors) or "none"
+    print(
+        f"{name:<8} insert {len(documents) / insert_duration:>10,.0f} docs/s  "
+        f"read {read / read_duration:>10,.0f} docs/s  client cpu {cpu_duration:>6.2f} s  "
+        f"in {(new_bytes_in - bytes_in) / 2**20:>8.1f} MiB  out {(new_bytes_out - bytes_out) / 2**20:>8.1f} MiB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    documents = [make_document(index) for index in range(args.documents)]
+    for compressors in [[], *([compressor] for compressor in Compressor)]:
+        if compressors and not is_available(compressors[0]):
+            print(f"{compressors[0].value:<8} skipped, the client package is not installed")
+            continue
+
+        await run(args.url, compressors, documents, args.batch_size)
+
+    mongo = MongoDBWrapper(get_logger("bench"), make_config(args.url, []))
+    await mongo.client.drop_database(DB_NAME)
+    mongo.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
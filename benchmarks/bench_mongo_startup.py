@@ -0,0 +1,125 @@
+"""
+Startup time of Mongo with N generated models, each with a few indexes and a view,
+for every schema_sync mode. ON_CHANGE is measured after a first start has stored the fingerprint,
+i.e. the usual restart of a service whose models did not change.
+
+A running MongoDB is required, the bench_mongo_startup database is dropped.
+
+Usage: python -m benchmarks.bench_mongo_startup [--url mongodb://localhost:27017] [--models N] [--rounds N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from beanie import Document, Indexed, View
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from mongo_odm import Mongo, MongoConfig, SchemaSyncMode
+
+
+def make_models(count: int) -> list[type[Document] | type[View]]:
+    models: list[type[Document] | type[View]] = []
+    for index in range(count):
+        settings = type(
+            "Settings",
+            (),
+            {
+                # pydantic takes nested classes whose qualname is not inside the model for fields
+                "__qualname__": f"BenchModel{index}.Settings",
+                "name": f"bench_model_{index}",
+                "indexes": [
+                    IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+                    IndexModel([("tags", ASCENDING)]),
+                ],
+            },
+        )
+        document = type(
+            f"BenchModel{index}",
+            (Document,),
+            {
+                "__module__": __name__,
+                "__qualname__": f"BenchModel{index}",
+                "__annotations__": {
+                    "login": Indexed(str, unique=True),
+                    "status": str,
+                    "tags": list[str],
+                    "created_at": int,
+                },
+                "Settings": settings,
+            },
+        )
+        view_settings = type(
+            "Settings",
+            (),
+            {
+                "__qualname__": f"BenchView{index}.Settings",
+                "name": f"bench_view_{index}",
+                "source": document,
+                "pipeline": [{"$match": {"status": "active"}}],
+            },
+        )
+        view = type(
+            f"BenchView{index}",
+            (View,),
+            {
+                "__module__": __name__,
+                "__qualname__": f"BenchView{index}",
+                "__annotations__": {"login": str},
+                "Settings": view_settings,
+            },
+        )
+        models += [document, view]
+
+    return models
+
+
+def make_config(url: str, mode: SchemaSyncMode) -> MongoConfig:
+    parts = urlsplit(url)
+    return MongoConfig(
+        host=parts.netloc.rpartition("@")[2],
+        db_name="bench_mongo_startup",
+        user=parts.username or "",
+        password=parts.password or "",
+        timeout_ms=10_000,
+        min_connections_count=0,
+        max_connections_count=10,
+        schema_sync=mode,
+    )
+
+
+async def start(config: MongoConfig, models: list[Any]) -> float:
+    mongo = Mongo(config, document_models=models)
+    async with mongo.use():
+        assert mongo.startup_duration is not None
+        return mongo.startup_duration
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--models", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    models = make_models(args.models)
+    mongo = Mongo(make_config(args.url, SchemaSyncMode.ALWAYS))
+    await mongo.client.drop_database("bench_mongo_startup")
+    mongo.client.close()
+
+    for mode in SchemaSyncMode:
+        config = make_config(args.url, mode)
+        if mode == SchemaSyncMode.ON_CHANGE:
+            # The first start stores the fingerprint
+            await start(config, models)
+
+        durations = [await start(config, models) for _ in range(args.rounds)]
+        print(f"{mode:<10} median {statistics.median(durations) * 1000:>9.1f} ms  max {max(durations) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    started_at = time.perf_counter()
+    asyncio.run(main())
+    print(f"total {time.perf_counter() - started_at:.1f} s")
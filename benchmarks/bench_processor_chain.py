@@ -0,0 +1,44 @@
+"""
+Per-event overhead of the default processors chain: ChainBuilder.build() vs ChainBuilder.compile().
+
+Usage: python -m benchmarks.bench_processor_chain [--events N]
+"""
+import argparse
+import logging
+import time
+from collections.abc import Callable
+
+from boilerplates.logging import ChainBuilder
+
+
+def run(chain: Callable[[dict], dict], events: int) -> float:
+    started_at = time.perf_counter()
+    for index in range(events):
+        chain({"event": "request handled", "index": index, "path": "/api/v1/items"})
+
+    return (time.perf_counter() - started_at) / events * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    for dt_format in ("iso", "%Y-%m-%d %H:%M:%S"):
+        builder = ChainBuilder.create_default_preset(is_sentry_enabled=False, dt_format=dt_format)
+        processors = builder.build()
+        compiled = builder.compile()
+
+        def run_list(event: dict) -> dict:
+            for processor in processors:
+                event = processor(logger, "info", event)
+
+            return event
+
+        for name, chain in (("list", run_list), ("compiled", lambda event: compiled(logger, "info", event))):
+            print(f"{dt_format:<20} {name:<10} {run(chain, args.events):>8.0f} ns/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-event overhead of the Sentry processor: disabled, eager breadcrumbs and lazy breadcrumbs.
+Events are sent to a transport that drops them.
+
+Usage: python -m benchmarks.bench_sentry_breadcrumbs [--events N]
+"""
+import argparse
+import logging
+import time
+from typing import Any
+
+import sentry_sdk
+from sentry_sdk.transport import Transport
+
+from boilerplates.logging import ChainBuilder
+
+
+class NullTransport(Transport):
+    def capture_envelope(self, envelope: Any) -> None:
+        ...
+
+
+def run(builder: ChainBuilder, events: int) -> float:
+    processors = builder.build()
+    logger = logging.getLogger("bench")
+    started_at = time.perf_counter()
+    for index in range(events):
+        event: Any = {"event": "request handled", "index": index, "path": "/api/v1/items"}
+        for processor in processors:
+            event = processor(logger, "info", event)
+
+    return (time.perf_counter() - started_at) / events * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sentry_sdk.init(dsn="http://key@localhost/1", transport=NullTransport, default_integrations=False)
+    presets = {
+        "disabled": ChainBuilder.create_default_preset(is_sentry_enabled=False),
+        "eager": ChainBuilder.create_default_preset(is_sentry_enabled=True),
+        "lazy": ChainBuilder.create_default_preset(is_sentry_enabled=True, sentry_lazy_breadcrumbs=True),
+    }
+    for name, builder in presets.items():
+        print(f"{name:<10} {run(builder, args.events):>8.0f} ns/event")
+
+
+if __name__ == "__main__":
+    main()
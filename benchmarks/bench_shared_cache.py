@@ -0,0 +1,113 @@
+"""
+Per-process caches (AsyncTTLCache) vs one SharedMemoryCache for several worker processes on a host.
+Every worker caches the same reference data (--keys entries) and then reads random keys.
+Printed per worker: the read latency and the growth of its private memory (RssAnon) after the data is cached.
+The shared segment is filled once by the parent process, as the first worker would do it.
+
+Linux only: memory is taken from /proc/self/status.
+
+Usage: python -m benchmarks.bench_shared_cache [--workers N] [--keys N] [--reads N]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+from typing import Any
+
+from boilerplates.cache import AsyncTTLCache
+from boilerplates.shared_cache import SharedMemoryCache
+from boilerplates.storage import StorageConfig
+
+SLOT_SIZE = 512
+
+
+def make_value(index: int) -> dict[str, Any]:
+    return {
+        "id": index,
+        "code": f"ITEM-{index:08d}",
+        "title": f"Reference item number {index}",
+        "price": index * 1.5,
+        "tags": ["reference", "catalog", f"group-{index % 100}"],
+        "is_active": bool(index % 7),
+    }
+
+
+def rss_anon_bytes() -> int:
+    with open("/proc/self/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) * 1024
+
+    raise RuntimeError("RssAnon is not available")
+
+
+def measure_reads(cache: Any, keys: int, reads: int) -> float:
+    indexes = [random.randrange(keys) for _ in range(reads)]
+    started_at = time.perf_counter()
+    for index in indexes:
+        cache.get(index)
+
+    return (time.perf_counter() - started_at) / reads * 1e9
+
+
+def local_worker(config: StorageConfig, keys: int, reads: int, results: Any) -> None:
+    rss_before = rss_anon_bytes()
+    cache: AsyncTTLCache[dict[str, Any]] = AsyncTTLCache(config)
+    for index in range(keys):
+        cache.set(index, make_value(index))
+
+    results.put((measure_reads(cache, keys, reads), rss_anon_bytes() - rss_before))
+
+
+def shared_worker(name: str, config: StorageConfig, keys: int, reads: int, results: Any) -> None:
+    rss_before = rss_anon_bytes()
+    cache = SharedMemoryCache(name, config, slot_size=SLOT_SIZE)
+    results.put((measure_reads(cache, keys, reads), rss_anon_bytes() - rss_before))
+    cache.close()
+
+
+def run(target: Any, args: tuple[Any, ...], workers: int) -> tuple[float, float]:
+    results: Any = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=target, args=(*args, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return statistics.mean(item[0] for item in measurements), statistics.mean(item[1] for item in measurements)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=500_000)
+    args = parser.parse_args()
+
+    # Spare slots: a key takes one of a few neighbouring slots
+    config = StorageConfig(cache_max_size=args.keys * 2, cache_ttl=timedelta(hours=1))
+    latency, memory = run(local_worker, (config, args.keys, args.reads), args.workers)
+    print(f"per-process cache {latency:>8.0f} ns/get  {memory / 2**20:>8.1f} MiB private memory per worker")
+
+    name = f"bench_shared_cache_{os.getpid()}"
+    cache = SharedMemoryCache(name, config, slot_size=SLOT_SIZE)
+    try:
+        for index in range(args.keys):
+            cache.set(index, make_value(index))
+
+        latency, memory = run(shared_worker, (name, config, args.keys, args.reads), args.workers)
+        print(f"shared cache      {latency:>8.0f} ns/get  {memory / 2**20:>8.1f} MiB private memory per worker")
+        segment_size = os.path.getsize(cache.path)
+        print(f"shared segment    {segment_size / 2**20:>8.1f} MiB per host, evictions {cache.metrics.evictions}")
+    finally:
+        cache.close()
+        cache.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Generic, ParamSpec
+
+from boilerplates.metrics import ComponentMetrics
+from boilerplates.storage import StorageConfig
+from boilerplates.types import T
+
+P = ParamSpec("P")
+_MISSING: Any = object()
+
+
+@dataclass
+class CacheMetrics(ComponentMetrics):
+    hits: int = 0
+    # Попадания в устаревшие значения, отданные до окончания фонового обновления
+    stale_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    load_errors: int = 0
+    invalidations: int = 0
+    # Вытеснены по размеру
+    evictions: int = 0
+    # Удалены по истечении TTL
+    expirations: int = 0
+
+
+class AsyncTTLCache(Generic[T]):
+    """
+    LRU-кэш с TTL для асинхронного кода.
+    Хранит не больше config.cache_max_size значений, каждое живёт config.cache_ttl.
+    get_or_load() схлопывает одновременные промахи по одному ключу в один вызов loader-а.
+    Если ключ инвалидирован, пока значение загружалось, загруженное значение не сохраняется.
+    on_evict вызывается для значений, вытесненных по размеру или истёкших по TTL, но не для инвалидированных.
+
+    При config.cache_stale_ttl > 0 get_or_load() ещё cache_stale_ttl после истечения TTL отдаёт устаревшее значение
+    и обновляет его в фоне (stale-while-revalidate), ошибка фонового обновления только учитывается в метриках.
+    get() устаревшие значения не отдаёт.
+
+    Пример использования:
+        ```python
+        cache = AsyncTTLCache[User](StorageConfig(cache_max_size=10_000, cache_ttl=timedelta(minutes=1)))
+        user = await cache.get_or_load(user_id, lambda: User.get(user_id))
+        ```
+    """
+
+    def __init__(
+        self,
+        config: StorageConfig,
+        on_evict: Callable[[Hashable, T], None] | None = None,
+    ) -> None:
+        self._max_size = config.cache_max_size
+        self._ttl = config.cache_ttl.total_seconds()
+        self._stale_ttl = config.cache_stale_ttl.total_seconds()
+        self._on_evict = on_evict
+        self._values: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Task[T]] = {}
+        self.metrics = CacheMetrics()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Hashable, default: Any = None) -> T | Any:
+        value, is_stale = self._get(key)
+        if value is _MISSING or is_stale:
+            self.metrics.misses += 1
+            return default
+
+        self.metrics.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        self._values[key] = (time.monotonic() + self._ttl, value)
+        self._values.move_to_end(key)
+        if len(self._values) > self._max_size:
+            evicted_key, (_, evicted) = self._values.popitem(last=False)
+            self.metrics.evictions += 1
+            self._evicted(evicted_key, evicted)
+
+    def invalidate(self, key: Hashable) -> None:
+        self.metrics.invalidations += 1
+        self._values.pop(key, None)
+        # Загрузка, начатая до инвалидации, может вернуть устаревшее значение - её результат не сохранится
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        self.metrics.invalidations += len(self._values)
+        self._values.clear()
+        self._loading.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        value, is_stale = self._get(key)
+        if value is not _MISSING:
+            if is_stale:
+                self.metrics.stale_hits += 1
+                self._start_load(key, loader).add_done_callback(_consume_error)
+            else:
+                self.metrics.hits += 1
+
+            return value
+
+        self.metrics.misses += 1
+        # shield: отмена одного из ожидающих не должна отменять общую загрузку
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def _get(self, key: Hashable) -> tuple[T | Any, bool]:
+        """Значение (или _MISSING) и признак того, что оно устарело, но ещё может быть отдано"""
+        item = self._values.get(key)
+        if item is None:
+            return _MISSING, False
+
+        expires_at, value = item
+        now = time.monotonic()
+        if expires_at + self._stale_ttl <= now:
+            del self._values[key]
+            self.metrics.expirations += 1
+            self._evicted(key, value)
+            return _MISSING, False
+
+        self._values.move_to_end(key)
+        return value, expires_at <= now
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = asyncio.create_task(self._load(key, loader))
+
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        self.metrics.loads += 1
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+        except BaseException:
+            self.metrics.load_errors += 1
+            raise
+        else:
+            if self._loading.get(key) is task:
+                self.set(key, value)
+
+            return value
+        finally:
+            if self._loading.get(key) is task:
+                del self._loading[key]
+
+    def _evicted(self, key: Hashable, value: T) -> None:
+        if self._on_evict:
+            self._on_evict(key, value)
+
+
+def _consume_error(task: asyncio.Task[Any]) -> None:
+    # Ошибку фоновой загрузки никто не ждёт, без этого asyncio залогирует "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+def _make_key(*args: Any, **kwargs: Any) -> Hashable:
+    return args, tuple(sorted(kwargs.items()))
+
+
+def cached(
+    config: StorageConfig,
+    key: Callable[..., Hashable] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Декоратор асинхронной функции, кэширующий её результаты в AsyncTTLCache.
+    Ключ по умолчанию строится из всех аргументов вызова, они должны быть hashable;
+    key(*args, **kwargs) задаёт свой ключ, например, без аргументов-сервисов.
+    Кэш доступен как атрибут cache обёрнутой функции, invalidate(*args, **kwargs) сбрасывает значение для аргументов.
+
+    Пример использования:
+        ```python
+        @cached(StorageConfig(cache_max_size=1000, cache_ttl=timedelta(minutes=5)))
+        async def get_rates(currency: str) -> Rates:
+            ...
+
+        get_rates.invalidate("USD")
+        ```
+    """
+    make_key = key or _make_key
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        cache: AsyncTTLCache[T] = AsyncTTLCache(config)
+
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await cache.get_or_load(make_key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        def invalidate(*args: Any, **kwargs: Any) -> None:
+            cache.invalidate(make_key(*args, **kwargs))
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        wrapper.invalidate = invalidate  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+__all__ = ("AsyncTTLCache", "CacheMetrics", "cached")
@@ -2,6 +2,7 @@ from contextlib import suppress
 
 STRUCTLOG_SUPPORTED = False
 PYDANTIC_V2_SUPPORTED = False
+ORJSON_SUPPORTED = False
 
 with suppress(ImportError):
     import structlog  # noqa: F401
@@ -13,7 +14,13 @@ with suppress(ImportError):
 
     PYDANTIC_V2_SUPPORTED = True
 
+with suppress(ImportError):
+    import orjson  # noqa: F401
+
+    ORJSON_SUPPORTED = True
+
 __all__ = (
     "STRUCTLOG_SUPPORTED",
     "PYDANTIC_V2_SUPPORTED",
+    "ORJSON_SUPPORTED",
 )
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+
+
+class HealthCheckable(Protocol):
+    async def health_check(self) -> bool:
+        ...
+
+
+class HealthRegistryConfig(BaseModel):
+    cache_ttl: timedelta = timedelta(seconds=5)
+    default_timeout: timedelta = timedelta(seconds=2)
+
+
+@dataclass
+class HealthCheckResult:
+    is_healthy: bool
+    duration: float
+    error: str | None = None
+
+
+@dataclass
+class HealthReport:
+    is_healthy: bool
+    checked_at: float
+    checks: dict[str, HealthCheckResult] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _RegisteredCheck:
+    check: Callable[[], Awaitable[bool]]
+    timeout: float
+    critical: bool
+
+
+class HealthRegistry:
+    """
+    Общий health check для компонентов сервиса.
+    Проверки запускаются конкурентно, каждая со своим таймаутом.
+    Результат кэшируется на cache_ttl, а одновременные запросы во время обновления
+    ждут одну и ту же проверку, поэтому check() можно дёргать с высокой частотой.
+    Некритичные проверки (critical=False) попадают в отчёт, но не влияют на is_healthy.
+
+    Пример использования:
+        ```python
+        registry = HealthRegistry(logger, HealthRegistryConfig(cache_ttl=timedelta(seconds=10)))
+        registry.register_component("mongo", mongo)
+        registry.register_component("rabbitmq", connection_holder, timeout=timedelta(seconds=1))
+        is_healthy = await registry.health_check()
+        ```
+    """
+
+    def __init__(self, logger: Any, config: HealthRegistryConfig | None = None) -> None:
+        self.logger = logger
+        self._config = config or HealthRegistryConfig()
+        self._checks: dict[str, _RegisteredCheck] = {}
+        self._report: HealthReport | None = None
+        self._refresh_task: asyncio.Task[HealthReport] | None = None
+
+    def register(
+        self,
+        name: str,
+        check: Callable[[], Awaitable[bool]],
+        timeout: timedelta | None = None,
+        critical: bool = True,
+    ) -> None:
+        if name in self._checks:
+            raise ValueError(f"Health check with name {name} already exists")
+
+        self._checks[name] = _RegisteredCheck(
+            check=check,
+            timeout=(timeout or self._config.default_timeout).total_seconds(),
+            critical=critical,
+        )
+        self._report = None
+
+    def register_component(
+        self,
+        name: str,
+        component: HealthCheckable,
+        timeout: timedelta | None = None,
+        critical: bool = True,
+    ) -> None:
+        self.register(name, component.health_check, timeout=timeout, critical=critical)
+
+    def unregister(self, name: str) -> None:
+        self._checks.pop(name, None)
+        self._report = None
+
+    async def health_check(self) -> bool:
+        return (await self.check()).is_healthy
+
+    async def check(self) -> HealthReport:
+        report = self._report
+        if report and time.monotonic() - report.checked_at < self._config.cache_ttl.total_seconds():
+            return report
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+
+        # shield: отмена одного из ожидающих не должна отменять общую проверку
+        return await asyncio.shield(self._refresh_task)
+
+    def _on_refresh_done(self, _task: asyncio.Task[HealthReport]) -> None:
+        self._refresh_task = None
+
+    async def _refresh(self) -> HealthReport:
+        # Снимок: проверки могут быть зарегистрированы или удалены, пока идёт обновление
+        registered = dict(self._checks)
+        results = await asyncio.gather(*(self._run_check(name, check) for name, check in registered.items()))
+        checks = dict(zip(registered, results))
+        report = HealthReport(
+            is_healthy=all(result.is_healthy for name, result in checks.items() if registered[name].critical),
+            checked_at=time.monotonic(),
+            checks=checks,
+        )
+        self._report = report
+        return report
+
+    async def _run_check(self, name: str, registered: _RegisteredCheck) -> HealthCheckResult:
+        started_at = time.monotonic()
+        try:
+            is_healthy = bool(await asyncio.wait_for(registered.check(), registered.timeout))
+            error = None
+        except asyncio.TimeoutError:
+            is_healthy, error = False, f"timeout after {registered.timeout} sec."
+        except Exception as exc:  # pylint: disable=broad-except
+            is_healthy, error = False, f"{type(exc).__name__}: {exc}"
+
+        if not is_healthy:
+            self.logger.warning(f"Health check {name} failed: {error}")
+
+        return HealthCheckResult(is_healthy=is_healthy, duration=time.monotonic() - started_at, error=error)
+
+
+__all__ = (
+    "HealthCheckable",
+    "HealthCheckResult",
+    "HealthRegistry",
+    "HealthRegistryConfig",
+    "HealthReport",
+)
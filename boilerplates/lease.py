@@ -0,0 +1,110 @@
+import asyncio
+import os
+import socket
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+from boilerplates.metrics import ComponentMetrics
+
+
+@dataclass
+class LeaseMetrics(ComponentMetrics):
+    acquired: int = 0
+    contended: int = 0
+    renewed: int = 0
+    renew_failed: int = 0
+    errors: int = 0
+
+
+class LeaseBackend(ABC):
+    """
+    Бэкенд распределённых блокировок (лизов) с ограниченным временем жизни.
+    Лиз захватывается по ключу на ttl и принадлежит владельцу owner.
+    Пока лиз удерживается через hold(), он периодически продлевается.
+    """
+
+    def __init__(self, logger: Any, owner: str | None = None) -> None:
+        self.logger = logger
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.metrics = LeaseMetrics()
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl: timedelta) -> bool:
+        """Захватить лиз. Возвращает False, если лиз удерживает другой владелец."""
+
+    @abstractmethod
+    async def renew(self, key: str, ttl: timedelta) -> bool:
+        """Продлить свой лиз. Возвращает False, если лиз уже потерян."""
+
+    @abstractmethod
+    async def release(self, key: str, hold_until: datetime | None = None) -> None:
+        """
+        Отпустить свой лиз.
+        Если передан hold_until, ключ остаётся занятым до этого момента.
+        """
+
+    @asynccontextmanager
+    async def hold(
+        self,
+        key: str,
+        ttl: timedelta,
+        hold_until: datetime | None = None,
+    ) -> AsyncGenerator[bool, None]:
+        """
+        Захватывает лиз и продлевает его каждые ttl / 3, пока выполняется блок.
+        Отдаёт True, если лиз захвачен. Ошибки бэкенда при захвате не пробрасываются,
+        в этом случае отдаётся False.
+        """
+        try:
+            acquired = await self.acquire(key, ttl)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.metrics.errors += 1
+            self.logger.error(f"Не удалось захватить лиз {key}: {exc}", exc_info=True)
+            yield False
+            return
+
+        if not acquired:
+            self.metrics.contended += 1
+            yield False
+            return
+
+        self.metrics.acquired += 1
+        renew_task = asyncio.create_task(self._renew_loop(key, ttl))
+        try:
+            yield True
+        finally:
+            renew_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await renew_task
+
+            try:
+                await self.release(key, hold_until)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.metrics.errors += 1
+                self.logger.error(f"Не удалось отпустить лиз {key}: {exc}", exc_info=True)
+
+    async def _renew_loop(self, key: str, ttl: timedelta) -> None:
+        interval = ttl.total_seconds() / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self.renew(key, ttl)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.metrics.errors += 1
+                self.logger.error(f"Ошибка продления лиза {key}: {exc}", exc_info=True)
+                continue
+
+            if renewed:
+                self.metrics.renewed += 1
+            else:
+                self.metrics.renew_failed += 1
+                self.logger.error(f"Лиз {key} потерян, задача может выполниться повторно на другой реплике")
+                return
+
+
+__all__ = ("LeaseBackend", "LeaseMetrics")
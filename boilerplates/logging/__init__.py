@@ -1,9 +1,24 @@
 from boilerplates._utils import optional_dependency
 
 with optional_dependency("logging"):
-    from .config import FileLoggingConfig, LoggingConfig
-    from .setup import ChainBuilder, StructlogFormatter, get_logger, setup_logging
-    from .types import LogFormat, LoggerType, LogLevel
+    from .access_log import AccessLogFormatter, AccessLogSamplingFilter, AccessLogTimingMiddleware
+    from .config import (
+        AccessLogConfig,
+        AsyncLoggingConfig,
+        ExceptionFormatConfig,
+        FileLoggingConfig,
+        LoggingConfig,
+        LogSamplingConfig,
+    )
+    from .setup import (
+        ChainBuilder,
+        StructlogFormatter,
+        get_log_queue_metrics,
+        get_logger,
+        setup_logging,
+        shutdown_logging,
+    )
+    from .types import LogFormat, LoggerType, LogLevel, QueueOverflowPolicy
     from .uvicorn import generate_uvicorn_log_config
 
 __all__ = (
@@ -17,4 +32,14 @@ __all__ = (
     "LoggingConfig",
     "LogLevel",
     "FileLoggingConfig",
+    "AsyncLoggingConfig",
+    "LogSamplingConfig",
+    "ExceptionFormatConfig",
+    "QueueOverflowPolicy",
+    "shutdown_logging",
+    "get_log_queue_metrics",
+    "AccessLogConfig",
+    "AccessLogFormatter",
+    "AccessLogSamplingFilter",
+    "AccessLogTimingMiddleware",
 )
@@ -0,0 +1,143 @@
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from functools import partial
+from typing import Any
+
+from .common_chain import CachedTimeStamper
+from .renderers import ORJSON_SUPPORTED
+from .types import LogFormat
+
+_request_started_at: ContextVar[float | None] = ContextVar("request_started_at", default=None)
+
+# uvicorn logs access as '%s - "%s %s HTTP/%s" %d' with these arguments
+_ACCESS_ARGS_COUNT = 5
+
+
+def _access_args(record: logging.LogRecord) -> tuple[Any, ...] | None:
+    args = record.args
+    if isinstance(args, tuple) and len(args) == _ACCESS_ARGS_COUNT:
+        return args
+
+    return None
+
+
+class AccessLogTimingMiddleware:
+    """
+    ASGI middleware that remembers the request start time in a context variable,
+    so the access log record gets `duration_ms` (time to the response start) and slow requests can be detected.
+
+    uvicorn writes the access log from the `send` call of the application, i.e. in the request context.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_started_at.set(time.perf_counter())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_started_at.reset(token)
+
+
+class AccessLogSamplingFilter(logging.Filter):
+    """
+    Keeps only a share of successful requests in the access log.
+    Requests with status >= keep_status_from and requests slower than slow_request_threshold seconds are always kept,
+    the latter requires AccessLogTimingMiddleware.
+    Sets `duration_ms` attribute of the record, None if the duration is unknown.
+    """
+
+    def __init__(
+        self,
+        success_sample_rate: float = 1.0,
+        slow_request_threshold: float | None = None,
+        keep_status_from: int = 400,
+    ) -> None:
+        super().__init__()
+        self._success_sample_rate = success_sample_rate
+        self._slow_request_threshold_ms = slow_request_threshold * 1000 if slow_request_threshold is not None else None
+        self._keep_status_from = keep_status_from
+        self._random = random.random
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        started_at = _request_started_at.get()
+        duration_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else None
+        record.duration_ms = duration_ms
+
+        if (args := _access_args(record)) is None or self._success_sample_rate >= 1:
+            return True
+
+        if args[4] >= self._keep_status_from:
+            return True
+
+        if (
+            duration_ms is not None
+            and self._slow_request_threshold_ms is not None
+            and duration_ms >= self._slow_request_threshold_ms
+        ):
+            return True
+
+        return self._random() < self._success_sample_rate
+
+
+class AccessLogFormatter(logging.Formatter):
+    """
+    Lean formatter for uvicorn.access records.
+    Takes the already parsed request fields from record.args and renders them directly,
+    without the processors chain, positional args formatting and exception processing.
+    Records of other loggers are formatted as "%(message)s".
+    """
+
+    def __init__(self, log_format: LogFormat, dt_format: str = "iso") -> None:
+        super().__init__()
+        self._log_format = log_format
+        self._timestamper = CachedTimeStamper(dt_format)
+        self._dumps = partial(json.dumps, ensure_ascii=False)
+        if log_format in (LogFormat.JSON, LogFormat.FAST_JSON) and ORJSON_SUPPORTED:
+            import orjson
+
+            self._dumps = lambda obj: orjson.dumps(obj).decode()
+
+    def format(self, record: logging.LogRecord) -> str:
+        if (args := _access_args(record)) is None:
+            return super().format(record)
+
+        client_addr, method, path, http_version, status_code = args
+        duration_ms = getattr(record, "duration_ms", None)
+        if self._log_format == LogFormat.PLAIN:
+            duration = f" {duration_ms:.1f}ms" if duration_ms is not None else ""
+            return (
+                f"{self._timestamper()} [{record.levelname.lower()}] {client_addr} - "
+                f'"{method} {path} HTTP/{http_version}" {status_code}{duration}'
+            )
+
+        event = {
+            "event": "request",
+            "client_addr": client_addr,
+            "method": method,
+            "path": path,
+            "http_version": http_version,
+            "status_code": status_code,
+            "timestamp": self._timestamper(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+        }
+        if duration_ms is not None:
+            event["duration_ms"] = round(duration_ms, 3)
+
+        return self._dumps(event)
+
+
+__all__ = (
+    "AccessLogFormatter",
+    "AccessLogSamplingFilter",
+    "AccessLogTimingMiddleware",
+)
@@ -1,5 +1,12 @@
+import linecache
 import sys
+import time
 import traceback
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import CodeType, TracebackType
+from typing import Any
 
 import structlog
 from structlog.types import EventDict, Processor, WrappedLogger
@@ -26,23 +33,301 @@ def add_exc_info(logger: WrappedLogger, name: str, event: EventDict) -> EventDic
     return event
 
 
-def exception_formatter(exc_info: structlog.types.ExcInfo) -> str:
-    formatter = traceback.TracebackException(*exc_info, limit=None, compact=True)
+def _join_traceback_chunks(chunks: Iterable[str]) -> str:
     if sys.version_info >= (3, 11):
         # remove python 3.11 traceback features
-        lines = (line.rstrip("\n").rstrip("^").rstrip(" ").rstrip("\n") for line in formatter.format(chain=True))
+        lines = (line.rstrip("\n").rstrip("^").rstrip(" ").rstrip("\n") for line in chunks)
         return "\n".join(lines)
 
-    return "\n".join(formatter.format(chain=True))
+    return "\n".join(chunks)
 
 
-def create_common_chain(dt_format: str | None = None) -> list[tuple[Processor, str]]:
+_RECURSIVE_CUTOFF = 3
+_FrameKey = tuple[CodeType, int]
+
+
+class ExceptionFormatter:
+    """
+    Formats exceptions like `traceback.TracebackException(...).format(chain=True)`, but caches rendered stacks.
+
+    The cache key is the exception type and the chain of code locations (code object, line number) of its
+    traceback, so the same failure logged over and over is rendered once. The exception message is always
+    rendered anew.
+
+    Args:
+        cache_size: maximum number of cached stacks, 0 disables caching
+        frame_limit: keep only this number of innermost frames of every traceback, None - keep all
+        compact: render every frame as a single line without source code
+    """
+
+    def __init__(self, cache_size: int = 256, frame_limit: int | None = None, compact: bool = False) -> None:
+        self._frame_limit = frame_limit
+        self._compact = compact
+        self._render_stack = self._render_stack_uncached
+        if cache_size:
+            # lru_cache is thread-safe and implemented in C
+            self._render_stack = lru_cache(maxsize=cache_size)(self._render_stack_uncached)
+
+    def __call__(self, exc_info: structlog.types.ExcInfo) -> str:
+        exc = exc_info[1]
+        if exc is None or (sys.version_info >= (3, 11) and isinstance(exc, BaseExceptionGroup)):
+            formatter = traceback.TracebackException(*exc_info, limit=None, compact=True)
+            return _join_traceback_chunks(formatter.format(chain=True))
+
+        return _join_traceback_chunks(self._format_chain(exc))
+
+    def cache_info(self) -> Any:
+        return getattr(self._render_stack, "cache_info", lambda: None)()
+
+    def _format_chain(self, exc: BaseException) -> Iterator[str]:
+        chain: list[tuple[BaseException, str | None]] = []
+        seen: set[int] = set()
+        message = None
+        current: BaseException | None = exc
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+            chain.append((current, message))
+            if current.__cause__ is not None:
+                message, current = _CAUSE_MESSAGE, current.__cause__
+            elif current.__context__ is not None and not current.__suppress_context__:
+                message, current = _CONTEXT_MESSAGE, current.__context__
+            else:
+                current = None
+
+        # message is stored with the exception it follows: the cause or the context of the previous one
+        for current, message in reversed(chain):
+            if current.__traceback__ is not None:
+                yield "Traceback (most recent call last):\n"
+                yield from self._render_stack(type(current), self._get_frame_keys(current.__traceback__))
+
+            yield from traceback.format_exception_only(type(current), current)
+            if message:
+                yield message
+
+    def _get_frame_keys(self, tb: TracebackType) -> tuple[_FrameKey, ...]:
+        keys = tuple((frame.f_code, lineno) for frame, lineno in traceback.walk_tb(tb))
+        if self._frame_limit is not None:
+            return keys[-self._frame_limit :] if self._frame_limit else ()
+
+        return keys
+
+    def _render_stack_uncached(self, _exc_type: type, frame_keys: tuple[_FrameKey, ...]) -> tuple[str, ...]:
+        rendered: list[str] = []
+        last_key: _FrameKey | None = None
+        repeated = 0
+        for key in frame_keys:
+            if key == last_key:
+                repeated += 1
+                if repeated >= _RECURSIVE_CUTOFF:
+                    continue
+            else:
+                if repeated >= _RECURSIVE_CUTOFF:
+                    rendered.append(_format_repeated(repeated - _RECURSIVE_CUTOFF + 1))
+
+                last_key, repeated = key, 0
+
+            rendered.append(self._render_frame(*key))
+
+        if repeated >= _RECURSIVE_CUTOFF:
+            rendered.append(_format_repeated(repeated - _RECURSIVE_CUTOFF + 1))
+
+        return tuple(rendered)
+
+    def _render_frame(self, code: CodeType, lineno: int) -> str:
+        if self._compact:
+            return f'  File "{code.co_filename}", line {lineno}, in {code.co_name}\n'
+
+        line = linecache.getline(code.co_filename, lineno).strip()
+        rendered = f'  File "{code.co_filename}", line {lineno}, in {code.co_name}\n'
+        return f"{rendered}    {line}\n" if line else rendered
+
+
+def _format_repeated(count: int) -> str:
+    return f"  [Previous line repeated {count} more time{'s' if count > 1 else ''}]\n"
+
+
+_CAUSE_MESSAGE = "\nThe above exception was the direct cause of the following exception:\n\n"
+_CONTEXT_MESSAGE = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+exception_formatter = ExceptionFormatter()
+
+
+class RecordTimeStamper(structlog.processors.TimeStamper):
+    """
+    TimeStamper that stamps records of stdlib loggers with their creation time instead of the current time,
+    so the records rendered later by the async logging listener keep the time of the call.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+        record = event_dict.get("_record")
+        if record is None:
+            return self._stamper(event_dict)
+
+        event_dict[self.key] = _format_timestamp(record.created, self.fmt, self.utc)
+        return event_dict
+
+
+def _format_timestamp(timestamp: float, fmt: str | None, utc: bool) -> Any:
+    # Same formats as structlog.processors.TimeStamper produces for the current time
+    if fmt is None:
+        return timestamp
+
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc if utc else None)
+    if fmt.upper() == "ISO":
+        return moment.isoformat().replace("+00:00", "Z") if utc else moment.isoformat()
+
+    return moment.strftime(fmt) if utc else moment.astimezone().strftime(fmt)
+
+
+def create_common_chain(
+    dt_format: str | None = None,
+    exc_formatter: Callable[[structlog.types.ExcInfo], str] = exception_formatter,
+) -> list[tuple[Processor, str]]:
     return [
-        (structlog.processors.TimeStamper(fmt=dt_format or "iso"), "add_timestamp"),
+        (RecordTimeStamper(fmt=dt_format or "iso"), "add_timestamp"),
         (structlog.stdlib.add_log_level, "add_log_level"),
         (structlog.stdlib.add_logger_name, "add_logger_name"),
         (add_exc_info, "add_exc_info"),
         (structlog.stdlib.PositionalArgumentsFormatter(), "format_positional_args"),
         (structlog.processors.StackInfoRenderer(), "add_stack_info"),
-        (structlog.processors.ExceptionRenderer(exception_formatter), "fix_exception_format"),
+        (structlog.processors.ExceptionRenderer(exc_formatter), "fix_exception_format"),
     ]
+
+
+class CachedTimeStamper:
+    """
+    UTC timestamp formatter that formats the date part at most once per second.
+    Supports "iso" and strftime formats without sub-second directives.
+    """
+
+    def __init__(self, fmt: str) -> None:
+        self._is_iso = fmt.upper() == "ISO"
+        self._fmt = "%Y-%m-%dT%H:%M:%S" if self._is_iso else fmt
+        self._cache: tuple[int, str] = (-1, "")
+
+    @staticmethod
+    def is_supported(fmt: str | None, utc: bool) -> bool:
+        return fmt is not None and utc and "%f" not in fmt
+
+    def __call__(self, now: float | None = None) -> str:
+        """Format now, by default - the current time"""
+        if now is None:
+            now = time.time()
+
+        second = int(now)
+        cached_second, formatted = self._cache
+        if cached_second != second:
+            formatted = datetime.fromtimestamp(second, tz=timezone.utc).strftime(self._fmt)
+            self._cache = (second, formatted)
+
+        if self._is_iso:
+            return f"{formatted}.{int((now - second) * 1_000_000):06d}Z"
+
+        return formatted
+
+
+_FUSABLE_PROCESSOR_NAMES = (
+    "add_timestamp",
+    "add_log_level",
+    "add_logger_name",
+    "add_exc_info",
+    "format_positional_args",
+    "add_stack_info",
+    "fix_exception_format",
+)
+_QUIET_METHOD_NAMES = frozenset(("info", "debug", "trace"))
+_METHOD_TO_LEVEL = {"warn": "warning", "exception": "error"}
+
+
+class FusedCommonChain:
+    """
+    Single callable replacing consecutive processors of the common chain.
+    Skips processors whose input keys are absent from the event and formats timestamps with CachedTimeStamper.
+    """
+
+    def __init__(self, processors: dict[str, Processor]) -> None:
+        self._processors = processors
+        self._timestamp_key = "timestamp"
+        self._stamper: Callable[[], Any] | None = None
+        if timestamper := processors.get("add_timestamp"):
+            self._timestamp_key = getattr(timestamper, "key", "timestamp")
+            fmt, utc = getattr(timestamper, "fmt", None), getattr(timestamper, "utc", False)
+            if CachedTimeStamper.is_supported(fmt, utc):
+                self._stamper = CachedTimeStamper(fmt)  # type: ignore[arg-type]
+
+        self._timestamper = timestamper if self._stamper is None else None
+        self._add_log_level = "add_log_level" in processors
+        self._add_logger_name = "add_logger_name" in processors
+        self._add_exc_info = "add_exc_info" in processors and sys.version_info >= (3, 11)
+        self._format_positional_args = processors.get("format_positional_args")
+        self._add_stack_info = processors.get("add_stack_info")
+        self._format_exception = processors.get("fix_exception_format")
+
+    def __call__(self, logger: WrappedLogger, name: str, event: EventDict) -> EventDict:
+        # Set for records of stdlib loggers, which are stamped with their creation time like in RecordTimeStamper
+        record = event.get("_record")
+        if self._stamper:
+            event[self._timestamp_key] = self._stamper(None if record is None else record.created)
+        elif self._timestamper:
+            event = self._timestamper(logger, name, event)  # type: ignore[assignment]
+
+        if self._add_log_level:
+            event["level"] = _METHOD_TO_LEVEL.get(name, name)
+
+        if self._add_logger_name:
+            event["logger"] = logger.name if record is None else record.name
+
+        if self._add_exc_info and name not in _QUIET_METHOD_NAMES and "exc_info" not in event and sys.exception():
+            event["exc_info"] = True
+
+        if self._format_positional_args and "positional_args" in event:
+            event = self._format_positional_args(logger, name, event)  # type: ignore[assignment]
+
+        if self._add_stack_info and "stack_info" in event:
+            event = self._add_stack_info(logger, name, event)  # type: ignore[assignment]
+
+        if self._format_exception and "exc_info" in event:
+            event = self._format_exception(logger, name, event)  # type: ignore[assignment]
+
+        return event
+
+
+def compile_chain(processors: Sequence[tuple[Processor, str]]) -> Processor:
+    """
+    Compile named processors into one callable.
+    Consecutive common chain processors in their original order are fused into FusedCommonChain,
+    other processors are called as is.
+    """
+    steps: list[Processor] = []
+    fused: dict[str, Processor] = {}
+    last_rank = -1
+    for processor, name in processors:
+        rank = _FUSABLE_PROCESSOR_NAMES.index(name) if name in _FUSABLE_PROCESSOR_NAMES else -1
+        if fused and rank <= last_rank:
+            steps.append(FusedCommonChain(fused))
+            fused = {}
+
+        if rank >= 0:
+            fused[name] = processor
+        else:
+            steps.append(processor)
+
+        last_rank = rank
+
+    if fused:
+        steps.append(FusedCommonChain(fused))
+
+    if len(steps) == 1:
+        return steps[0]
+
+    chain = tuple(steps)
+
+    def run_chain(logger: WrappedLogger, name: str, event: EventDict) -> EventDict:
+        for step in chain:
+            event = step(logger, name, event)  # type: ignore[assignment]
+
+        return event
+
+    return run_chain
@@ -1,8 +1,10 @@
+from datetime import timedelta
 from pathlib import Path
+from typing import Annotated
 
 from pydantic import BaseModel, Field
 
-from .types import LogFormat, LogLevel
+from .types import LogFormat, LogLevel, QueueOverflowPolicy
 
 
 class FileLoggingConfig(BaseModel):
@@ -12,6 +14,81 @@ class FileLoggingConfig(BaseModel):
     )
     logs_folder: Path = Field(..., description="The folder where logs will be stored")
     logger_names: list[str] = Field(..., description="Logger names that will be logged to files")
+    max_bytes: int | None = Field(default=None, gt=0, description="Rotate a file when it exceeds this size")
+    rotate_interval: timedelta | None = Field(default=None, description="Rotate a file after this time")
+    backup_count: int = Field(default=5, ge=1, description="Number of rotated files to keep")
+    compress_rotated: bool = Field(default=False, description="If True, rotated files are gzipped in background")
+    background_writer: bool = Field(
+        default=False,
+        description="If True, files are written with buffering by a dedicated thread instead of the calling one",
+    )
+    buffer_size: int = Field(default=64 * 1024, gt=0, description="Write buffer size in bytes for background writer")
+    flush_interval: float = Field(default=1.0, gt=0, description="Buffers flush interval in seconds")
+    queue_size: int = Field(default=100_000, gt=0, description="Maximum number of records waiting to be written")
+    block_timeout: float = Field(
+        default=1.0,
+        gt=0,
+        description="Maximum blocking time in seconds when the writer queue is full, the record is dropped after it",
+    )
+
+
+class AsyncLoggingConfig(BaseModel):
+    queue_size: int = Field(default=10_000, gt=0, description="Maximum number of records waiting to be written")
+    overflow_policy: QueueOverflowPolicy = Field(
+        default=QueueOverflowPolicy.DROP,
+        description="What to do with a new record when the queue is full: block the caller or drop the record",
+    )
+    block_timeout: float | None = Field(
+        default=None,
+        description="Maximum blocking time in seconds for BLOCK policy, the record is dropped after it. None - no limit",
+    )
+
+
+class LogSamplingConfig(BaseModel):
+    level_rates: dict[str, Annotated[float, Field(ge=0, le=1)]] = Field(
+        default_factory=dict,
+        description="Share of events to keep per level, e.g. {'debug': 0.01}",
+    )
+    rate_limit: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum average number of events per second for each (logger, event) pair",
+    )
+    rate_limit_burst: int = Field(
+        default=10,
+        ge=1,
+        description="Number of events allowed at once before rate limiting",
+    )
+    duplicates_window: float | None = Field(
+        default=None,
+        gt=0,
+        description="Repeats of the same event during this number of seconds are suppressed",
+    )
+    max_keys: int = Field(default=10_000, gt=0, description="Maximum number of tracked keys per processor")
+
+
+class AccessLogConfig(BaseModel):
+    success_sample_rate: float = Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        description="Share of successful requests written to the access log",
+    )
+    slow_request_threshold: timedelta | None = Field(
+        default=None,
+        description="Requests slower than this are always logged, requires AccessLogTimingMiddleware",
+    )
+    keep_status_from: int = Field(default=400, description="Requests with this or higher status are always logged")
+
+
+class ExceptionFormatConfig(BaseModel):
+    cache_size: int = Field(default=256, ge=0, description="Number of cached rendered tracebacks, 0 disables cache")
+    frame_limit: int | None = Field(
+        default=None,
+        ge=0,
+        description="Number of innermost frames kept in every traceback, None - keep all",
+    )
+    compact: bool = Field(default=False, description="If True, every frame is rendered as one line without source")
 
 
 class LoggingConfig(BaseModel):
@@ -19,7 +96,27 @@ class LoggingConfig(BaseModel):
     log_format: LogFormat = Field(..., description="The format of the logs")
     log_level: LogLevel = Field(..., description="The log level for the root logger")
     is_sentry_enabled: bool = Field(..., description="If True, Sentry integration will be enabled")
+    sentry_lazy_breadcrumbs: bool = Field(
+        default=False,
+        description="If True, Sentry breadcrumbs are built only when an event is captured",
+    )
     dt_format: str = Field(default="iso", description="Date format")
     clear_existing_handlers: bool = Field(default=True, description="If True, existing log handlers will be cleared")
     log_levels: dict[str, LogLevel] = Field(default_factory=dict, description="Log levels for specific loggers")
     file_logging: FileLoggingConfig | None = Field(default=None, description="File logging configuration")
+    sampling: LogSamplingConfig | None = Field(
+        default=None,
+        description="Sampling and deduplication of structlog events, used by the default chain preset",
+    )
+    exception_format: ExceptionFormatConfig | None = Field(
+        default=None,
+        description="Traceback rendering options of the default chain preset",
+    )
+    compile_chain: bool = Field(
+        default=False,
+        description="If True, the default chain preset is compiled into one callable, see ChainBuilder.compile",
+    )
+    async_logging: AsyncLoggingConfig | None = Field(
+        default=None,
+        description="If set, stdout records are rendered and written by a background thread",
+    )
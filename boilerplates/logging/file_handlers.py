@@ -0,0 +1,135 @@
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import IO, Any
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    File handler with size- and time-based rotation and buffered writes.
+
+    Writes go to a buffer of buffer_size bytes which is flushed at most once per flush_interval seconds,
+    so the handler is meant to be used from a background writer thread that also flushes it when idle.
+    If compressor is passed, rotated files are gzipped on it and get the ".gz" suffix. The file is renamed
+    to a temporary name at rotation, and the gzipped backups are shifted by the compression jobs in rotation order,
+    so rotations faster than compression do not overwrite each other.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        filename: str | Path,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        rotate_interval: float | None = None,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        compressor: Executor | None = None,
+    ) -> None:
+        if (max_bytes or rotate_interval) and backup_count < 1:
+            raise ValueError("backup_count must be positive when rotation is enabled")
+
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._flushed_at = time.monotonic()
+        self._rotate_interval = rotate_interval
+        self._rotate_at = time.time() + rotate_interval if rotate_interval else None
+        self._compressor = compressor
+        self._pending_rotations: deque[str] = deque()
+        self._compress_lock = threading.Lock()
+        self._written = 0
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        if compressor:
+            self.namer = _gz_namer
+
+    def _open(self) -> IO[Any]:
+        stream = open(  # pylint: disable=consider-using-with
+            self.baseFilename,
+            self.mode,
+            buffering=self._buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        # The written size is tracked by the handler: tell() on a text stream flushes its buffer
+        self._written = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def format(self, record: logging.LogRecord) -> str:
+        # Called once per emitted record, right before the message is written
+        message = super().format(record)
+        self._written += len(message) + len(self.terminator)
+        return message
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        if self._rotate_at is not None and time.time() >= self._rotate_at:
+            return True
+
+        # Unlike the base class, the record is not formatted twice: rotate once the limit is exceeded.
+        # The size is counted in characters, so with non-ASCII messages files grow a bit over max_bytes
+        return bool(self.maxBytes and self._written >= self.maxBytes)
+
+    def doRollover(self) -> None:  # noqa: N802
+        if self._compressor is None:
+            super().doRollover()
+        else:
+            self._rollover_to_compressor()
+
+        self._flushed_at = time.monotonic()
+        if self._rotate_interval:
+            self._rotate_at = time.time() + self._rotate_interval
+
+    def flush(self) -> None:
+        # Called by StreamHandler.emit after every record
+        if time.monotonic() - self._flushed_at >= self._flush_interval:
+            self.force_flush()
+
+    def force_flush(self) -> None:
+        super().flush()
+        self._flushed_at = time.monotonic()
+
+    def _rollover_to_compressor(self) -> None:
+        # Like RotatingFileHandler.doRollover, but the backups are shifted by _compress_next
+        if self.stream:
+            self.stream.close()
+            self.stream = None  # type: ignore[assignment]
+
+        if os.path.exists(self.baseFilename):
+            # A unique name, so that the next rotation does not clash with the file being compressed
+            pending = f"{self.baseFilename}.{time.time_ns()}.tmp"
+            os.rename(self.baseFilename, pending)
+            with self._compress_lock:
+                self._pending_rotations.append(pending)
+
+            self._compressor.submit(self._compress_next)  # type: ignore[union-attr]
+
+        if not self.delay:
+            self.stream = self._open()
+
+    def _compress_next(self) -> None:
+        # Every job takes the oldest rotation, so backups are shifted in rotation order on any number of workers
+        with self._compress_lock:
+            pending = self._pending_rotations.popleft()
+            compressed = f"{pending}.gz"
+            with open(pending, "rb") as src, gzip.open(compressed, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+
+            for index in range(self.backupCount - 1, 0, -1):
+                source = self.rotation_filename(f"{self.baseFilename}.{index}")
+                if os.path.exists(source):
+                    os.replace(source, self.rotation_filename(f"{self.baseFilename}.{index + 1}"))
+
+            os.replace(compressed, self.rotation_filename(f"{self.baseFilename}.1"))
+            os.remove(pending)
+
+
+def _gz_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+__all__ = ("BufferedRotatingFileHandler",)
@@ -0,0 +1,157 @@
+import contextvars
+import copy
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from logging.handlers import QueueHandler
+from typing import Any
+
+from boilerplates.metrics import ComponentMetrics
+
+from .types import QueueOverflowPolicy
+
+_STOP = object()
+
+
+@dataclass
+class LogQueueMetrics(ComponentMetrics):
+    enqueued: int = 0
+    dropped: int = 0
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records into a bounded queue without formatting them, rendering happens on the listener thread.
+    When the queue is full, the record is either dropped or the caller blocks, depending on overflow_policy.
+
+    Like QueueHandler.prepare, everything that may change after the call is resolved in the caller thread
+    on a copy of the record: the message of stdlib records is merged with its args, and the contextvars
+    context is captured and entered by the listener while the record is handled, so processors like
+    merge_contextvars see the fields bound by the caller. Tracebacks are rendered from exc_info by the listener.
+
+    Records of stdlib loggers are run through the foreign chain on the listener thread, the timestamp processor
+    of the common chain stamps them with record.created, so a backlog does not skew their time.
+    """
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[logging.LogRecord]",
+        overflow_policy: QueueOverflowPolicy,
+        block_timeout: float | None = None,
+    ) -> None:
+        super().__init__(log_queue)
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self.metrics = LogQueueMetrics()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Records of structlog loggers carry their own event dict, stdlib args may be mutated by the caller
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+
+        record.log_context = contextvars.copy_context()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self._overflow_policy == QueueOverflowPolicy.BLOCK:
+                self.queue.put(record, timeout=self._block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.metrics.dropped += 1
+            return
+
+        self.metrics.enqueued += 1
+
+
+class RoutedQueueHandler(BoundedQueueHandler):
+    """Queue handler whose records are passed only to its target handler by the listener"""
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[Any]",
+        target: logging.Handler,
+        overflow_policy: QueueOverflowPolicy,
+        block_timeout: float | None = None,
+    ) -> None:
+        super().__init__(log_queue, overflow_policy=overflow_policy, block_timeout=block_timeout)
+        self.target = target
+
+    def prepare(self, record: logging.LogRecord) -> Any:
+        return self.target, super().prepare(record)
+
+
+class LogListenerThread(threading.Thread):
+    """
+    Background thread that takes records from the queue and passes them to the handlers.
+    Records put by RoutedQueueHandler are passed only to their target handler.
+    If flush_interval is set, handlers are flushed when no records arrive during this time.
+    """
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[Any]",
+        handlers: list[logging.Handler],
+        name: str = "log-listener",
+        flush_interval: float | None = None,
+    ) -> None:
+        super().__init__(name=name, daemon=True)
+        self._queue = log_queue
+        self._handlers = handlers
+        self._flush_interval = flush_interval
+
+    def run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                self._flush()
+                continue
+
+            if item is _STOP:
+                break
+
+            if isinstance(item, tuple):
+                self._handle_by(item[0], item[1])
+            else:
+                self._handle(item)
+
+        self._flush()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Write all queued records and stop the thread"""
+        if self.is_alive():
+            self._queue.put(_STOP)  # type: ignore[arg-type]
+            self.join(timeout)
+
+    def _handle(self, record: logging.LogRecord) -> None:
+        for handler in self._handlers:
+            self._handle_by(handler, record)
+
+    @staticmethod
+    def _handle_by(handler: logging.Handler, record: logging.LogRecord) -> None:
+        if record.levelno < handler.level:
+            return
+
+        context: contextvars.Context | None = getattr(record, "log_context", None)
+        if context is None:
+            handler.handle(record)
+        else:
+            context.run(handler.handle, record)
+
+    def _flush(self) -> None:
+        for handler in self._handlers:
+            # Buffered handlers flush on their own schedule, force them when idle
+            getattr(handler, "force_flush", handler.flush)()
+
+
+__all__ = (
+    "BoundedQueueHandler",
+    "LogListenerThread",
+    "LogQueueMetrics",
+    "RoutedQueueHandler",
+)
@@ -0,0 +1,59 @@
+import logging
+from typing import Any
+
+from structlog.types import EventDict, WrappedLogger
+
+from boilerplates.features import ORJSON_SUPPORTED
+
+
+def _orjson_default(obj: Any) -> Any:
+    # orjson handles datetime, UUID, Enum and dataclasses natively
+    if model_dump := getattr(obj, "model_dump", None):
+        return model_dump(mode="json")
+
+    if structlog_repr := getattr(obj, "__structlog__", None):
+        return structlog_repr()
+
+    # The same fallback as structlog.processors.JSONRenderer
+    return repr(obj)
+
+
+class FastJSONRenderer:
+    """Renders the event dict to JSON bytes using orjson. Requires orjson to be installed."""
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> bytes:
+        return self._dumps(event_dict, default=_orjson_default, option=self._option)
+
+
+class BytesStreamHandler(logging.StreamHandler):
+    """
+    Stream handler for binary streams (e.g. sys.stdout.buffer).
+    Uses formatter.format_bytes() when the formatter provides it, so the rendered bytes are written without
+    a str round trip.
+    """
+
+    terminator_bytes = b"\n"
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            format_bytes = getattr(self.formatter, "format_bytes", None)
+            data = format_bytes(record) if format_bytes else self.format(record).encode()
+            self.stream.write(data + self.terminator_bytes)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+
+__all__ = (
+    "ORJSON_SUPPORTED",
+    "BytesStreamHandler",
+    "FastJSONRenderer",
+)
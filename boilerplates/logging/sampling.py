@@ -0,0 +1,257 @@
+import atexit
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from structlog.types import EventDict, WrappedLogger
+
+# Set while DuplicateSuppressor emits its summaries, so that no sampling processor drops them
+_emitting_summaries: ContextVar[bool] = ContextVar("emitting_summaries", default=False)
+_METHOD_TO_LEVEL = {
+    "exception": "error",
+    "warn": "warning",
+    "fatal": "critical",
+    "msg": "info",
+}
+
+
+def _is_foreign(event_dict: EventDict) -> bool:
+    # Records of stdlib loggers are processed inside the formatter, where an event cannot be dropped
+    return event_dict.get("_from_structlog") is False
+
+
+def _level_of(name: str) -> str:
+    return _METHOD_TO_LEVEL.get(name, name)
+
+
+class LevelSampler:
+    """Passes only a share of events of the given levels, e.g. {"debug": 0.01} keeps 1% of debug events"""
+
+    name = "sample_by_level"
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        self._rates = {level.lower(): rate for level, rate in rates.items()}
+        self._random = random.random
+
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+        rate = self._rates.get(_level_of(name))
+        if rate is not None and self._random() >= rate and not _is_foreign(event_dict):
+            if not _emitting_summaries.get():
+                raise structlog.DropEvent
+
+        return event_dict
+
+
+class _BoundedStateMap(OrderedDict):
+    """LRU map of per-key state, the least recently used key is evicted when max_keys is exceeded"""
+
+    def __init__(self, max_keys: int) -> None:
+        super().__init__()
+        self._max_keys = max_keys
+
+    def touch(self, key: Hashable, default_factory: type) -> object:
+        state = self.get(key)
+        if state is None:
+            state = self[key] = default_factory()
+            if len(self) > self._max_keys:
+                self.popitem(last=False)
+        else:
+            self.move_to_end(key)
+
+        return state
+
+
+@dataclass
+class _Bucket:
+    tokens: float = -1.0
+    updated_at: float = 0.0
+    dropped: int = 0
+
+
+class RateLimiter:
+    """
+    Token bucket per (logger, event) key: at most `burst` events at once and `rate` events per second on average.
+    The first event passed after drops gets the `rate_limited` key with the number of dropped events.
+    """
+
+    name = "rate_limit"
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10_000) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._buckets = _BoundedStateMap(max_keys)
+        self._lock = threading.Lock()
+
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+        if _is_foreign(event_dict):
+            return event_dict
+
+        key = (event_dict.get("logger"), event_dict.get("event"))
+        now = time.monotonic()
+        with self._lock:
+            bucket: _Bucket = self._buckets.touch(key, _Bucket)  # type: ignore[assignment]
+            if bucket.tokens < 0:
+                bucket.tokens = self._burst
+            else:
+                bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated_at) * self._rate)
+
+            bucket.updated_at = now
+            if bucket.tokens < 1 and not _emitting_summaries.get():
+                bucket.dropped += 1
+                raise structlog.DropEvent
+
+            bucket.tokens = max(0.0, bucket.tokens - 1)
+            dropped, bucket.dropped = bucket.dropped, 0
+
+        if dropped:
+            event_dict["rate_limited"] = dropped
+
+        return event_dict
+
+
+@dataclass
+class _Window:
+    started_at: float = -1.0
+    suppressed: int = 0
+    logger: Any = None
+    method: str = ""
+    event: Any = None
+
+
+class DuplicateSuppressor:
+    """
+    Passes the first of repeated (logger, level, event) events and drops the repeats during `window` seconds.
+
+    The number of dropped repeats is reported in the `suppressed` key of either the first event after the window,
+    or, if there is none, of a summary event with the same logger, level and event. Summaries go through
+    the configured chain, but are not dropped by the sampling processors. They are emitted by a background thread,
+    started at the first suppressed repeat, within `window` seconds after the window expires, and for all
+    pending windows on flush() and close(). close() also stops the thread (it is started again by the next repeat),
+    it is called for all running suppressors by shutdown_logging() or at process exit.
+    """
+
+    name = "suppress_duplicates"
+
+    def __init__(self, window: float, max_keys: int = 10_000) -> None:
+        self._window = window
+        self._windows = _BoundedStateMap(max_keys)
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+        if _is_foreign(event_dict) or _emitting_summaries.get():
+            return event_dict
+
+        key = (event_dict.get("logger"), name, event_dict.get("event"))
+        now = time.monotonic()
+        with self._lock:
+            window: _Window = self._windows.touch(key, _Window)  # type: ignore[assignment]
+            if window.started_at >= 0 and now - window.started_at < self._window:
+                window.suppressed += 1
+                if self._flusher is None:
+                    self._start_flusher()
+
+                raise structlog.DropEvent
+
+            window.started_at = now
+            window.logger, window.method, window.event = logger, _level_of(name), event_dict.get("event")
+            suppressed, window.suppressed = window.suppressed, 0
+
+        if suppressed:
+            event_dict["suppressed"] = suppressed
+
+        return event_dict
+
+    def flush(self) -> None:
+        """Emit summaries of all repeats suppressed so far"""
+        self._emit_summaries(expired_only=False)
+
+    def close(self) -> None:
+        """Stop the background thread and emit summaries of all repeats suppressed so far"""
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+            self._stopped.set()
+
+        with _running_suppressors_lock:
+            _running_suppressors.discard(self)
+
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+
+        self.flush()
+
+    def _start_flusher(self) -> None:
+        # Called under self._lock
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(self._stopped,),
+            name="log-dedup",
+            daemon=True,
+        )
+        self._flusher.start()
+        with _running_suppressors_lock:
+            _running_suppressors.add(self)
+
+    def _flush_periodically(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._window):
+            self._emit_summaries(expired_only=True)
+
+    def _emit_summaries(self, expired_only: bool) -> None:
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            for window in self._windows.values():
+                if window.suppressed and (not expired_only or now - window.started_at >= self._window):
+                    summaries.append((window.logger, window.method, window.event, window.suppressed))
+                    window.suppressed = 0
+                    # The next repeat is passed as the first event of a new window
+                    window.started_at = -1.0
+
+        if not summaries:
+            return
+
+        token = _emitting_summaries.set(True)
+        try:
+            for logger, method, event, suppressed in summaries:
+                # The summary goes through the whole configured chain, like the suppressed events did
+                getattr(structlog.wrap_logger(logger), method)(event, suppressed=suppressed)
+        finally:
+            _emitting_summaries.reset(token)
+
+
+_running_suppressors: set[DuplicateSuppressor] = set()
+_running_suppressors_lock = threading.Lock()
+
+
+def close_duplicate_suppressors() -> None:
+    """Close all DuplicateSuppressor instances with a running background thread, see DuplicateSuppressor.close"""
+    with _running_suppressors_lock:
+        suppressors = list(_running_suppressors)
+
+    for suppressor in suppressors:
+        suppressor.close()
+
+
+atexit.register(close_duplicate_suppressors)
+
+
+BUILTIN_PROCESSORS: dict[str, type] = {
+    processor.name: processor for processor in (LevelSampler, RateLimiter, DuplicateSuppressor)
+}
+
+
+__all__ = (
+    "BUILTIN_PROCESSORS",
+    "DuplicateSuppressor",
+    "close_duplicate_suppressors",
+    "LevelSampler",
+    "RateLimiter",
+)
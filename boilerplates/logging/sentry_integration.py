@@ -1,14 +1,36 @@
+import asyncio
+import threading
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from typing import Any
 
 from boilerplates._utils import optional_dependency
 
 with optional_dependency("logging-sentry"):
-    from structlog.types import EventDict
+    from structlog.types import EventDict, WrappedLogger
     from structlog_sentry import SentryProcessor as SimpleSentryProcessor
 
+_MAX_CACHED_LOGGER_NAMES = 1024
+# Time of the log call, kept with a buffered breadcrumb until it is sent
+_BREADCRUMB_TIMESTAMP_KEY = "_breadcrumb_timestamp"
+# Tasks and threads started with a copy of the context inherit the value, so the buffer is kept with its owner
+_pending_breadcrumbs: ContextVar[tuple[Any, deque[EventDict]] | None] = ContextVar("pending_breadcrumbs", default=None)
+
+
+def _get_breadcrumbs_owner() -> Any:
+    """The current asyncio task, or the current thread outside of tasks"""
+    loop = asyncio._get_running_loop()  # pylint: disable=protected-access
+    return (loop is not None and asyncio.current_task(loop)) or threading.get_ident()
+
 
 class SentryProcessor(SimpleSentryProcessor):
-    """Extensions to SentryProcessor, appends additional information provided by the logger to breadcrumbs"""
+    """Extensions to SentryProcessor, appends additional information provided by the logger to breadcrumbs
+
+    With lazy_breadcrumbs=True, shallow copies of events are kept in a bounded per-context ring buffer and turned
+    into breadcrumbs, stamped with the time of the log call, when an event is actually captured.
+    A task or thread that inherits the context starts its own buffer, so concurrent requests do not share breadcrumbs.
+    """
 
     name = "add_sentry_integration"
 
@@ -19,8 +41,13 @@ class SentryProcessor(SimpleSentryProcessor):
         event_level: int,
         active: bool = False,
         tag_keys: list[str] | str | None = None,
+        lazy_breadcrumbs: bool = False,
+        breadcrumbs_buffer_size: int = 100,
     ) -> None:
         self.breadcrumb_level = breadcrumb_level
+        self._lazy_breadcrumbs = lazy_breadcrumbs
+        self._breadcrumbs_buffer_size = breadcrumbs_buffer_size
+        self._can_record_by_logger: dict[str | None, bool] = {}
         super().__init__(
             level=level,
             active=active,
@@ -28,12 +55,73 @@ class SentryProcessor(SimpleSentryProcessor):
             event_level=event_level,
         )
 
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+        if not self._lazy_breadcrumbs:
+            return super().__call__(logger, name, event_dict)
+
+        sentry_skip = event_dict.pop("sentry_skip", False)
+        if self.active and not sentry_skip and self._can_record(logger, event_dict):
+            level = self._get_level_value(event_dict["level"].upper())
+
+            if level >= self.event_level:
+                self._original_event_dict = dict(event_dict)
+                self._flush_breadcrumbs()
+                self._handle_event(event_dict)
+
+            if level >= self.level:
+                self._buffer_breadcrumb(event_dict)
+
+        if self.verbose:
+            event_dict.setdefault("sentry", "skipped")
+
+        return event_dict
+
+    def _can_record(self, logger: WrappedLogger, event_dict: EventDict) -> bool:
+        # Ignored loggers are matched by fnmatch patterns, so the result is cached per logger name
+        logger_name = self._get_logger_name(logger=logger, event_dict=event_dict)
+        can_record = self._can_record_by_logger.get(logger_name)
+        if can_record is None:
+            if len(self._can_record_by_logger) >= _MAX_CACHED_LOGGER_NAMES:
+                self._can_record_by_logger.clear()
+
+            can_record = self._can_record_by_logger[logger_name] = super()._can_record(logger, event_dict)
+        elif not can_record and self.verbose:
+            event_dict["sentry"] = "ignored"
+
+        return can_record
+
+    def _buffer_breadcrumb(self, event_dict: EventDict) -> None:
+        owner = _get_breadcrumbs_owner()
+        buffer = _pending_breadcrumbs.get()
+        if buffer is None or buffer[0] != owner:
+            pending: deque[EventDict] = deque(maxlen=self._breadcrumbs_buffer_size)
+            _pending_breadcrumbs.set((owner, pending))
+        else:
+            pending = buffer[1]
+
+        # Renderers later in the chain may modify or consume the event dict, so a copy is buffered
+        breadcrumb_event = dict(event_dict)
+        breadcrumb_event[_BREADCRUMB_TIMESTAMP_KEY] = datetime.now(timezone.utc)
+        pending.append(breadcrumb_event)
+
+    def _flush_breadcrumbs(self) -> None:
+        buffer = _pending_breadcrumbs.get()
+        # A buffer inherited from another task or thread holds its breadcrumbs, not ours
+        if buffer is None or buffer[0] != _get_breadcrumbs_owner():
+            return
+
+        pending = buffer[1]
+
+        while pending:
+            self._handle_breadcrumb(pending.popleft())
+
     def _get_breadcrumb_and_hint(self, event_dict: EventDict) -> tuple[dict[Any, Any], dict[Any, Any]]:
         data = event_dict.copy()
         event = data.pop("event")
         logger = data.pop("logger", None)
         level = data.pop("level", None)
         data.pop("timestamp", None)
+        timestamp = data.pop(_BREADCRUMB_TIMESTAMP_KEY, None)
 
         breadcrumb = {
             "ty": "log",
@@ -42,5 +130,7 @@ class SentryProcessor(SimpleSentryProcessor):
             "message": event,
             "data": data,
         }
+        if timestamp is not None:
+            breadcrumb["timestamp"] = timestamp
 
         return breadcrumb, {"log_record": event_dict}
@@ -1,16 +1,117 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import structlog
-from structlog.types import FilteringBoundLogger, Processor
+from structlog._config import BoundLoggerLazyProxy
+from structlog.types import BindableLogger, FilteringBoundLogger, Processor
+
+from .common_chain import ExceptionFormatter, compile_chain, create_common_chain, exception_formatter
+from .config import (
+    AsyncLoggingConfig,
+    ExceptionFormatConfig,
+    FileLoggingConfig,
+    LoggingConfig,
+    LogSamplingConfig,
+)
+from .file_handlers import BufferedRotatingFileHandler
+from .queue_handler import BoundedQueueHandler, LogListenerThread, LogQueueMetrics, RoutedQueueHandler
+from .renderers import ORJSON_SUPPORTED, BytesStreamHandler, FastJSONRenderer
+from .sampling import (
+    BUILTIN_PROCESSORS,
+    DuplicateSuppressor,
+    LevelSampler,
+    RateLimiter,
+    close_duplicate_suppressors,
+)
+from .types import LogFormat, LogLevel, QueueOverflowPolicy
+
+_listener: LogListenerThread | None = None
+_queue_handler: BoundedQueueHandler | None = None
+_file_listener: LogListenerThread | None = None
+_file_compressor: ThreadPoolExecutor | None = None
+_file_handlers: list[tuple[logging.Logger, logging.Handler]] = []
+_logger_levels: "_LoggerLevels | None" = None
+_STANDARD_LEVELS = (logging.NOTSET, logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+
+
+class _LoggerLevels:
+    """Effective levels of named loggers, resolved by the logger hierarchy like logging.Logger.getEffectiveLevel"""
+
+    def __init__(self, root_level: LogLevel, log_levels: dict[str, LogLevel]) -> None:
+        self.root_level = _to_standard_level(root_level)
+        self._levels = {name: _to_standard_level(level) for name, level in log_levels.items()}
+        self._resolved: dict[str, int] = {}
+
+    @property
+    def min_level(self) -> int:
+        """The lowest level any logger may have, used for loggers whose name is unknown"""
+        return min([self.root_level, *self._levels.values()])
 
-from .common_chain import create_common_chain
-from .config import FileLoggingConfig, LoggingConfig
-from .types import LogFormat
+    def level_for(self, name: str) -> int:
+        if (level := self._resolved.get(name)) is None:
+            level = self._resolved[name] = self._resolve(name)
+
+        return level
+
+    def _resolve(self, name: str) -> int:
+        while name:
+            if (level := self._levels.get(name)) is not None:
+                return level
+
+            name = name.rpartition(".")[0]
+
+        return self.root_level
+
+
+class _LevelFilteringLoggerProxy(BoundLoggerLazyProxy):
+    """
+    Lazy proxy of a named logger created by `get_logger` before `setup_logging`, e.g. at module import.
+
+    On the first use after setup it binds the logger filtering by the effective level of its name, as `get_logger`
+    does after setup, and keeps the methods of the cached bound logger, so later calls skip __getattr__.
+    """
+
+    def bind(self, **new_values: Any) -> BindableLogger:
+        if _logger_levels is not None and self._wrapper_class is None:
+            self._wrapper_class = structlog.make_filtering_bound_logger(
+                _logger_levels.level_for(self._logger_factory_args[0]),
+            )
+
+        return super().bind(**new_values)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = super().__getattr__(name)
+        # bind is replaced with the cached bound logger once logging is configured, its methods do not change
+        if "bind" in self.__dict__ and not name.startswith("_"):
+            setattr(self, name, attr)
+
+        return attr
+
+
+def _to_standard_level(level: LogLevel) -> int:
+    if isinstance(level, str):
+        if not isinstance(level_number := logging.getLevelName(level.upper()), int):
+            raise ValueError(f"Unknown log level: {level}")
+
+        level = level_number
+
+    # Filtering bound loggers exist only for the standard levels, a custom level is rounded down
+    return max(standard for standard in _STANDARD_LEVELS if standard <= level)
 
 
 class StructlogFormatter(structlog.stdlib.ProcessorFormatter):
+    """
+    Renders structlog and stdlib records with the chosen log format.
+
+    With LogFormat.FAST_JSON the record is rendered to bytes by orjson, format_bytes() returns them as is
+    (used by BytesStreamHandler), format() decodes them for text handlers.
+    """
+
     def __init__(
         self,
         log_format: LogFormat,
@@ -18,10 +119,17 @@ class StructlogFormatter(structlog.stdlib.ProcessorFormatter):
         use_colors: bool = False,
     ) -> None:
         renderer: Any
+        self._bytes_renderer: FastJSONRenderer | None = None
+        self._rendered = threading.local()
 
         match log_format:
             case LogFormat.JSON:
                 renderer = structlog.processors.JSONRenderer(ensure_ascii=False)
+            case LogFormat.FAST_JSON if ORJSON_SUPPORTED:
+                self._bytes_renderer = FastJSONRenderer()
+                renderer = self._render_bytes
+            case LogFormat.FAST_JSON:
+                renderer = structlog.processors.JSONRenderer(ensure_ascii=False)
             case LogFormat.PLAIN:
                 renderer = structlog.dev.ConsoleRenderer(colors=use_colors)
             case _:
@@ -35,6 +143,29 @@ class StructlogFormatter(structlog.stdlib.ProcessorFormatter):
             ],
         )
 
+    @property
+    def renders_bytes(self) -> bool:
+        return self._bytes_renderer is not None
+
+    def format(self, record: logging.LogRecord) -> str:
+        if self._bytes_renderer is None:
+            return super().format(record)
+
+        return self.format_bytes(record).decode()
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        if self._bytes_renderer is None:
+            return super().format(record).encode()
+
+        # ProcessorFormatter requires the last processor to return str,
+        # so the bytes renderer stores its result aside and returns an empty message
+        super().format(record)
+        return self._rendered.value
+
+    def _render_bytes(self, logger: Any, name: str, event_dict: Any) -> str:
+        self._rendered.value = self._bytes_renderer(logger, name, event_dict)  # type: ignore[misc]
+        return ""
+
 
 class ChainBuilder:
     def __init__(self) -> None:
@@ -51,14 +182,19 @@ class ChainBuilder:
         is_sentry_enabled: bool,
         dt_format: str | None = None,
         exclude_processor_names: list[str] | None = None,
+        sampling: LogSamplingConfig | None = None,
+        exception_format: ExceptionFormatConfig | None = None,
+        sentry_lazy_breadcrumbs: bool = False,
     ) -> "ChainBuilder":
         return (
             cls()
             .add_common_chain(
                 dt_format=dt_format,
                 exclude_processor_names=exclude_processor_names,
+                exception_format=exception_format,
             )
-            .add_sentry(is_sentry_enabled)
+            .add_sampling(sampling)
+            .add_sentry(is_sentry_enabled, lazy_breadcrumbs=sentry_lazy_breadcrumbs)
         )
 
     def add(
@@ -117,16 +253,26 @@ class ChainBuilder:
         self,
         dt_format: str | None = None,
         exclude_processor_names: list[str] | None = None,
+        exception_format: ExceptionFormatConfig | None = None,
     ) -> "ChainBuilder":
         """Add common chain to the chain
 
         Args:
             exclude_processor_names (list[str] | None, optional): exclude processors with provided names from chain.
+            exception_format (ExceptionFormatConfig | None, optional): traceback rendering options.
 
         Raises:
             ValueError: if common chain contains processors with names already in chain
         """
-        chain = create_common_chain(dt_format=dt_format)
+        exc_formatter = exception_formatter
+        if exception_format:
+            exc_formatter = ExceptionFormatter(
+                cache_size=exception_format.cache_size,
+                frame_limit=exception_format.frame_limit,
+                compact=exception_format.compact,
+            )
+
+        chain = create_common_chain(dt_format=dt_format, exc_formatter=exc_formatter)
         if {name for _, name in chain}.intersection(self._processor_names):
             raise ValueError("Common chain contains processors with names already in chain")
 
@@ -138,11 +284,80 @@ class ChainBuilder:
 
         return self
 
-    def add_sentry(self, is_sentry_enabled: bool) -> "ChainBuilder":
+    def add_builtin(
+        self,
+        name: str,
+        /,
+        append_after: str | None,
+        **options: Any,
+    ) -> "ChainBuilder":
+        """Add builtin processor by its name
+
+        Args:
+            name (str): one of "sample_by_level", "rate_limit", "suppress_duplicates"
+            append_after (str | None): see `add`
+            options: processor constructor arguments
+
+        Raises:
+            ValueError: if there is no builtin processor with provided name or it is already in chain
+        """
+        if (processor_cls := BUILTIN_PROCESSORS.get(name)) is None:
+            raise ValueError(f"Unknown builtin processor {name}")
+
+        return self.add(processor_cls(**options), name, append_after=append_after)
+
+    def add_sampling(self, config: LogSamplingConfig | None) -> "ChainBuilder":
+        """Add sampling and deduplication processors enabled in config.
+
+        Processors are placed right after the logger name is added, so dropped events skip the rest of the chain.
+        Only structlog events are sampled, events of stdlib loggers always pass.
+
+        Args:
+            config (LogSamplingConfig | None): sampling configuration, None to skip
+
+        Raises:
+            ValueError: if processor with the same name already exists
+        """
+        if not config:
+            return self
+
+        append_after = next(
+            (name for name in ("add_logger_name", "add_log_level") if name in self._processor_names),
+            None,
+        )
+        processors: list[tuple[Processor, str]] = []
+        if config.level_rates:
+            processors.append((LevelSampler(config.level_rates), LevelSampler.name))
+
+        if config.duplicates_window:
+            processors.append(
+                (DuplicateSuppressor(config.duplicates_window, config.max_keys), DuplicateSuppressor.name),
+            )
+
+        if config.rate_limit:
+            processors.append(
+                (RateLimiter(config.rate_limit, config.rate_limit_burst, config.max_keys), RateLimiter.name),
+            )
+
+        for processor, name in processors:
+            self.add(processor, name, append_after=append_after)
+            if append_after:
+                append_after = name
+
+        return self
+
+    def add_sentry(
+        self,
+        is_sentry_enabled: bool,
+        lazy_breadcrumbs: bool = False,
+        breadcrumbs_buffer_size: int = 100,
+    ) -> "ChainBuilder":
         """Add sentry integration to the chain. Requires "logging-sentry" extra to be installed.
 
         Args:
             is_sentry_enabled (bool): whether sentry integration should be added
+            lazy_breadcrumbs (bool): build breadcrumbs only when an event is captured, see SentryProcessor
+            breadcrumbs_buffer_size (int): number of pending breadcrumbs kept per context in lazy mode
 
         Raises:
             ValueError: if processor with name already exists
@@ -157,6 +372,8 @@ class ChainBuilder:
             event_level=logging.WARNING,
             breadcrumb_level=logging.DEBUG,
             active=True,
+            lazy_breadcrumbs=lazy_breadcrumbs,
+            breadcrumbs_buffer_size=breadcrumbs_buffer_size,
         )
 
         if processor.name in self._processor_names:
@@ -175,6 +392,13 @@ class ChainBuilder:
         """Get resulting list of processors"""
         return [processor for processor, _ in self._processors]
 
+    def compile(self) -> Processor:
+        """Get the chain as one callable, with common chain processors fused and timestamps cached.
+
+        Usage: `setup_logging(config=..., processors_chain=[builder.compile()])`
+        """
+        return compile_chain(self._processors)
+
     def _get_index(self, name: str) -> int:
         for index, (_, processor_name) in enumerate(self._processors):
             if processor_name == name:
@@ -196,16 +420,30 @@ def setup_logging(
 
         processors_chain (list[Processor] | None, optional):
             Custom processors chain. If None, default chain preset will be used. Defaults to None.
+
+    Loggers returned by `get_logger` are level-filtering: calls below the logger level return at once, without
+    running the processors chain. The levels are taken from config.log_level and config.log_levels at the time
+    of setup (for loggers created before setup - at their first use after it), changing the level of a stdlib
+    logger later does not enable the filtered methods.
     """
+    global _logger_levels  # pylint: disable=global-statement
+
     if not processors_chain:
-        processors_chain = ChainBuilder.create_default_preset(
+        builder = ChainBuilder.create_default_preset(
             is_sentry_enabled=config.is_sentry_enabled,
             dt_format=config.dt_format,
-        ).build()
+            sampling=config.sampling,
+            exception_format=config.exception_format,
+            sentry_lazy_breadcrumbs=config.sentry_lazy_breadcrumbs,
+        )
+        processors_chain = [builder.compile()] if config.compile_chain else builder.build()
 
+    _logger_levels = _LoggerLevels(config.log_level, config.log_levels or {})
     structlog.configure(
         processors=processors_chain + [structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
         logger_factory=structlog.stdlib.LoggerFactory(),
+        # Used by loggers created without a name or before setup_logging
+        wrapper_class=structlog.make_filtering_bound_logger(_logger_levels.min_level),
         cache_logger_on_first_use=True,
     )
 
@@ -215,8 +453,11 @@ def setup_logging(
         use_colors=config.use_colors,
     )
 
-    handler = logging.StreamHandler(stream=sys.stdout)
-    handler.setFormatter(formatter)
+    handler = _create_stdout_handler(formatter)
+    shutdown_logging()
+    if config.async_logging:
+        handler = _start_queue_listener(config.async_logging, [handler])
+
     root_logger = logging.getLogger()
 
     if config.clear_existing_handlers:
@@ -233,15 +474,86 @@ def setup_logging(
         _add_logging_to_files(config.file_logging, config.log_format, processors_chain)
 
 
+def _create_stdout_handler(formatter: StructlogFormatter) -> logging.Handler:
+    handler: logging.Handler
+    # sys.stdout may be replaced by a text-only stream, e.g. in tests
+    if formatter.renders_bytes and (stdout_buffer := getattr(sys.stdout, "buffer", None)):
+        handler = BytesStreamHandler(stream=stdout_buffer)
+    else:
+        handler = logging.StreamHandler(stream=sys.stdout)
+
+    handler.setFormatter(formatter)
+    return handler
+
+
+def shutdown_logging() -> None:
+    """Write records left in the async logging queues, stop the background threads and close log files.
+
+    Called at exit.
+    """
+    global _listener, _queue_handler, _file_listener, _file_compressor  # pylint: disable=global-statement
+
+    # Summaries of suppressed duplicates are written while the handlers are still running
+    close_duplicate_suppressors()
+
+    if _listener:
+        _listener.stop()
+
+    _listener = None
+    _queue_handler = None
+
+    # Loggers stop writing to files before the file handlers are closed
+    for logger, handler in _file_handlers:
+        logger.removeHandler(handler)
+
+    if _file_listener:
+        _file_listener.stop()
+
+    for _, handler in _file_handlers:
+        getattr(handler, "target", handler).close()
+
+    if _file_compressor:
+        _file_compressor.shutdown(wait=True)
+
+    _file_handlers.clear()
+    _file_listener = None
+    _file_compressor = None
+
+
+def get_log_queue_metrics() -> LogQueueMetrics | None:
+    """Metrics of the async logging queue, None if async logging is disabled"""
+    return _queue_handler.metrics if _queue_handler else None
+
+
+def _start_queue_listener(config: AsyncLoggingConfig, handlers: list[logging.Handler]) -> logging.Handler:
+    global _listener, _queue_handler  # pylint: disable=global-statement
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=config.queue_size)
+    _queue_handler = BoundedQueueHandler(
+        log_queue,
+        overflow_policy=config.overflow_policy,
+        block_timeout=config.block_timeout,
+    )
+    _listener = LogListenerThread(log_queue, handlers)
+    _listener.start()
+    return _queue_handler
+
+
+atexit.register(shutdown_logging)
+
+
 def _add_logging_to_files(
     config: FileLoggingConfig,
     log_format: LogFormat,
     processors_chain: list[Processor],
 ) -> None:
+    global _file_listener, _file_compressor  # pylint: disable=global-statement
+
     if config.clean_dir_on_setup:
-        for file in config.logs_folder.glob("*.log"):
-            if file.is_file():
-                file.unlink()
+        for pattern in ("*.log", "*.log.*"):
+            for file in config.logs_folder.glob(pattern):
+                if file.is_file():
+                    file.unlink()
 
     formatter = StructlogFormatter(
         log_format=log_format,
@@ -249,20 +561,77 @@ def _add_logging_to_files(
         use_colors=False,  # file logs should not have colors
     )
 
+    if config.compress_rotated:
+        _file_compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compressor")
+
+    file_queue: "queue.Queue[Any]" = queue.Queue(maxsize=config.queue_size)
+    file_handlers: list[logging.Handler] = []
     for logger_name in config.logger_names:
         logger = logging.getLogger(logger_name)
-        file_handler = logging.FileHandler(config.logs_folder / f"{logger_name}.log")
+        file_handler = BufferedRotatingFileHandler(
+            config.logs_folder / f"{logger_name}.log",
+            max_bytes=config.max_bytes or 0,
+            backup_count=config.backup_count,
+            rotate_interval=config.rotate_interval.total_seconds() if config.rotate_interval else None,
+            buffer_size=config.buffer_size,
+            # Without the writer thread nobody flushes idle buffers, so every record is flushed at once
+            flush_interval=config.flush_interval if config.background_writer else 0,
+            compressor=_file_compressor,
+        )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handlers.append(file_handler)
+
+        handler: logging.Handler = file_handler
+        if config.background_writer:
+            handler = RoutedQueueHandler(
+                file_queue,
+                file_handler,
+                overflow_policy=QueueOverflowPolicy.BLOCK,
+                block_timeout=config.block_timeout,
+            )
+
+        logger.addHandler(handler)
+        _file_handlers.append((logger, handler))
+
+    if config.background_writer:
+        _file_listener = LogListenerThread(
+            file_queue,
+            file_handlers,
+            name="log-file-writer",
+            flush_interval=config.flush_interval,
+        )
+        _file_listener.start()
 
 
 def get_logger(*args: Any, **kwargs: Any) -> FilteringBoundLogger:
-    return structlog.get_logger(*args, **kwargs)
+    """Get a structlog logger, the first positional argument is the stdlib logger name.
+
+    A named logger filters levels below the effective level of its stdlib logger (config.log_levels are resolved
+    by the logger hierarchy), so disabled calls like `logger.debug(...)` are no-ops. A logger created before
+    `setup_logging`, like a module-level `logger = get_logger(__name__)`, gets its level at the first use after setup.
+    Note that an f-string argument is still built by the caller.
+    """
+    if not args or not isinstance(args[0], str) or "wrapper_class" in kwargs:
+        return structlog.get_logger(*args, **kwargs)
+
+    if _logger_levels is None:
+        proxy = _LevelFilteringLoggerProxy(None, initial_values=kwargs, logger_factory_args=args)
+        return proxy  # type: ignore[return-value]
+
+    # Logging is already configured, so the logger is bound at once instead of returning a lazy proxy,
+    # which would resolve every method call through __getattr__
+    return structlog.wrap_logger(
+        None,
+        wrapper_class=structlog.make_filtering_bound_logger(_logger_levels.level_for(args[0])),
+        logger_factory_args=args,
+    ).bind(**kwargs)
 
 
 __all__ = (
     "LogFormat",
     "ChainBuilder",
     "setup_logging",
+    "shutdown_logging",
+    "get_log_queue_metrics",
     "get_logger",
 )
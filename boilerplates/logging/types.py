@@ -9,6 +9,14 @@ from boilerplates.enums import LowerStringEnum
 class LogFormat(LowerStringEnum):
     JSON = auto()
     PLAIN = auto()
+    # JSON rendered by orjson straight to bytes, falls back to JSON when orjson is not installed
+    FAST_JSON = auto()
+
+
+@unique
+class QueueOverflowPolicy(LowerStringEnum):
+    BLOCK = auto()
+    DROP = auto()
 
 
 LogLevel = str | int
@@ -18,5 +26,6 @@ LoggerType = FilteringBoundLogger
 __all__ = (
     "LogFormat",
     "LogLevel",
+    "QueueOverflowPolicy",
     "LoggerType",
 )
@@ -2,6 +2,8 @@ from typing import Any, Type
 
 from structlog.stdlib import ProcessorFormatter
 
+from .access_log import AccessLogFormatter, AccessLogSamplingFilter
+from .config import AccessLogConfig
 from .setup import ChainBuilder, LogFormat
 from .types import LogLevel
 
@@ -11,14 +13,23 @@ def generate_uvicorn_log_config(
     formatter: Type[ProcessorFormatter],
     log_format: LogFormat,
     is_sentry_enabled: bool,
+    access_log: AccessLogConfig | None = None,
 ) -> dict[str, Any]:
+    """Generate log config for uvicorn
+
+    Args:
+        access_log (AccessLogConfig | None, optional):
+            If set, uvicorn.access records are rendered by the lean AccessLogFormatter, bypassing the processors
+            chain, and successful requests are sampled. Wrap the application into AccessLogTimingMiddleware
+            to log request durations and always keep slow requests.
+    """
     formatter_cfg = {
         "()": formatter,
         "log_format": log_format,
         "foreign_chain": ChainBuilder.create_default_preset(is_sentry_enabled).build(),
     }
 
-    return {
+    log_config: dict[str, Any] = {
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
@@ -41,3 +52,28 @@ def generate_uvicorn_log_config(
             },
         },
     }
+
+    if access_log:
+        slow_request_threshold = access_log.slow_request_threshold
+        log_config["formatters"]["access"] = {"()": AccessLogFormatter, "log_format": log_format}
+        log_config["filters"] = {
+            "access_sampling": {
+                "()": AccessLogSamplingFilter,
+                "success_sample_rate": access_log.success_sample_rate,
+                "slow_request_threshold": slow_request_threshold.total_seconds() if slow_request_threshold else None,
+                "keep_status_from": access_log.keep_status_from,
+            },
+        }
+        log_config["handlers"]["access"] = {
+            "class": "logging.StreamHandler",
+            "formatter": "access",
+            "filters": ["access_sampling"],
+            "stream": "ext://sys.stdout",
+        }
+        log_config["loggers"]["uvicorn.access"] = {
+            "level": log_level,
+            "handlers": ["access"],
+            "propagate": False,
+        }
+
+    return log_config
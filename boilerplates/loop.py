@@ -1,67 +1,217 @@
 import asyncio
+import time
+import zlib
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from boilerplates.metrics import ComponentMetrics, Histogram
 
 
 class LoopLifecycleConfig(BaseModel):
     wait_between_iteration: timedelta
     wait_between_iteration_when_error: timedelta
+    # Если задан потолок, задержка растёт в backoff_multiplier раз после каждой пустой/ошибочной итерации
+    max_wait_between_iteration: Optional[timedelta] = None
+    max_wait_between_iteration_when_error: Optional[timedelta] = None
+    backoff_multiplier: float = 2.0
+    # Количество параллельных воркеров, каждый выполняет свои итерации независимо
+    parallelism: int = Field(default=1, ge=1)
+
+
+@dataclass(frozen=True)
+class LoopPartition:
+    """Подсказка воркеру, какую часть работы брать: index из count"""
+
+    index: int
+    count: int
+
+    def owns(self, key: int | str | bytes) -> bool:
+        if isinstance(key, int):
+            return key % self.count == self.index
+
+        if isinstance(key, str):
+            key = key.encode()
+
+        # crc32 стабилен между процессами, в отличие от hash() для строк
+        return zlib.crc32(key) % self.count == self.index
+
+
+@dataclass
+class LoopWorkerState:
+    partition: LoopPartition
+    is_last_iter_succeeded: bool = False
+    is_current_iter_succeeded: bool = False
+    idle_streak: int = 0
+    error_streak: int = 0
+    iterations: int = 0
+    current_delay: float = 0.0
+    task: Optional[asyncio.Task] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "partition": self.partition.index,
+            "is_running": bool(self.task) and not self.task.done(),
+            "is_last_iter_succeeded": self.is_last_iter_succeeded,
+            "iterations": self.iterations,
+            "current_delay": self.current_delay,
+        }
+
+
+_current_worker: ContextVar[LoopWorkerState] = ContextVar("loop_worker")
+
+
+@dataclass
+class LoopMetrics(ComponentMetrics):
+    iterations: int = 0
+    errors: int = 0
+    drained: int = 0
+    busy_seconds: float = 0.0
+    sleep_seconds: float = 0.0
+    duty_cycle: float = 0.0
+    iteration_latency: Histogram = field(default_factory=Histogram)
 
 
 class BaseLoop(ABC):
+    """
+    Бесконечный цикл вызовов _do_iteration() с задержкой между итерациями.
+
+    _do_iteration() может сообщить о наличии работы:
+        True - есть ещё работа, следующая итерация запускается сразу;
+        False - работы не было, задержка растёт до max_wait_between_iteration;
+        None или любое другое значение - обычная задержка wait_between_iteration.
+    После ошибок задержка аналогично растёт до max_wait_between_iteration_when_error.
+
+    При parallelism > 1 итерации выполняют несколько независимых воркеров.
+    Внутри _do_iteration() свойство partition подсказывает, какую часть работы брать текущему воркеру.
+    health_check() успешен, только если успешны все воркеры, состояние каждого - в workers_health().
+    """
+
     def __init__(self, logger, loop_config: LoopLifecycleConfig):
         self._loop_config = loop_config
         self.logger = logger
-        self._is_last_iter_succeeded = False
-        self._is_current_iter_succeeded = False
-        self._loop_task: Optional[asyncio.Task] = None
+        self._workers = [
+            LoopWorkerState(partition=LoopPartition(index=index, count=loop_config.parallelism))
+            for index in range(loop_config.parallelism)
+        ]
+        self.metrics = LoopMetrics()
+
+    @property
+    def partition(self) -> LoopPartition:
+        """Часть работы текущего воркера. Вне воркера - вся работа"""
+        if worker := _current_worker.get(None):
+            return worker.partition
+
+        return LoopPartition(index=0, count=1)
 
     async def start_loop(self):
-        self._loop_task = asyncio.create_task(self._main_loop())
+        for worker in self._workers:
+            worker.task = asyncio.create_task(self._main_loop(worker))
 
     async def stop_loop(self):
-        if self._loop_task:
-            self._loop_task.cancel()
-            try:
-                await self._loop_task
-            except asyncio.CancelledError:
-                self.logger.debug(f"{self._loop_task!r} отменен")
-            finally:
-                self._loop_task = None
+        for worker in self._workers:
+            if worker.task:
+                worker.task.cancel()
+                try:
+                    await worker.task
+                except asyncio.CancelledError:
+                    self.logger.debug(f"{worker.task!r} отменен")
+                finally:
+                    worker.task = None
 
     async def health_check(self) -> bool:
-        return self._is_last_iter_succeeded and bool(self._loop_task)
+        return all(worker.is_last_iter_succeeded and bool(worker.task) for worker in self._workers)
+
+    def workers_health(self) -> list[dict[str, Any]]:
+        return [worker.as_dict() for worker in self._workers]
 
     async def callback_iteration_failed(self, exception: Exception) -> None:
-        self._is_last_iter_succeeded = False
+        if worker := _current_worker.get(None):
+            worker.is_last_iter_succeeded = False
 
-    async def _main_loop(self):
-        self.logger.debug("Бесконечный цикл запущен")
+    async def _main_loop(self, worker: LoopWorkerState):
+        # Задача создаётся с копией контекста, поэтому значение видно только этому воркеру
+        _current_worker.set(worker)
+        self.logger.debug(f"Бесконечный цикл запущен, воркер {worker.partition.index}")
         while True:
+            started_at = time.monotonic()
             try:
-                self._is_current_iter_succeeded = True
-                delay = self._loop_config.wait_between_iteration.total_seconds()
-                await self._do_iteration()
+                worker.is_current_iter_succeeded = True
+                has_more_work = await self._do_iteration()
+                delay = self._get_delay_after_success(worker, has_more_work)
                 self.logger.debug(f"Итерация завершилась, до след. запуска {delay} сек.")
 
             except asyncio.CancelledError:
                 break
 
             except Exception as exc:  # pylint: disable=broad-except
-                self._is_current_iter_succeeded = False
-                delay = self._loop_config.wait_between_iteration_when_error.total_seconds()
+                worker.is_current_iter_succeeded = False
+                self.metrics.errors += 1
+                delay = self._get_delay_after_error(worker)
                 self.logger.error(
                     f"Ошибка в цикле, перед повторным запуском добавим задержку {delay} сек. " f"{exc}",
                     exc_info=True,
                 )
                 await self.callback_iteration_failed(exc)
 
-            self._is_last_iter_succeeded = self._is_current_iter_succeeded
+            worker.is_last_iter_succeeded = worker.is_current_iter_succeeded
+            worker.iterations += 1
+            worker.current_delay = delay
+            self._observe_iteration(time.monotonic() - started_at, delay)
+            # sleep(0) тоже отдаёт управление event loop-у
             await asyncio.sleep(delay)
 
+    def _get_delay_after_success(self, worker: LoopWorkerState, has_more_work: Any) -> float:
+        worker.error_streak = 0
+        # Сравнение по is: наследники могут возвращать из _do_iteration() счётчики, списки и т.п.,
+        # для них сохраняется обычная задержка
+        if has_more_work is True:
+            worker.idle_streak = 0
+            self.metrics.drained += 1
+            return 0.0
+
+        if has_more_work is not False:
+            worker.idle_streak = 0
+            return self._loop_config.wait_between_iteration.total_seconds()
+
+        delay, worker.idle_streak = self._backoff(
+            self._loop_config.wait_between_iteration,
+            self._loop_config.max_wait_between_iteration,
+            worker.idle_streak,
+        )
+        return delay
+
+    def _get_delay_after_error(self, worker: LoopWorkerState) -> float:
+        worker.idle_streak = 0
+        delay, worker.error_streak = self._backoff(
+            self._loop_config.wait_between_iteration_when_error,
+            self._loop_config.max_wait_between_iteration_when_error,
+            worker.error_streak,
+        )
+        return delay
+
+    def _backoff(self, base: timedelta, cap: Optional[timedelta], streak: int) -> tuple[float, int]:
+        """Возвращает задержку для текущей серии и длину серии для следующего вызова"""
+        if cap is None:
+            return base.total_seconds(), streak
+
+        delay = min(base.total_seconds() * self._loop_config.backoff_multiplier**streak, cap.total_seconds())
+        # Не наращиваем серию после достижения потолка, чтобы степень не переполнилась
+        return delay, streak + 1 if delay < cap.total_seconds() else streak
+
+    def _observe_iteration(self, latency: float, delay: float) -> None:
+        metrics = self.metrics
+        metrics.iterations += 1
+        metrics.iteration_latency.observe(latency)
+        metrics.busy_seconds += latency
+        metrics.sleep_seconds += delay
+        total = metrics.busy_seconds + metrics.sleep_seconds
+        metrics.duty_cycle = metrics.busy_seconds / total if total else 0.0
+
     @abstractmethod
-    async def _do_iteration(self):
+    async def _do_iteration(self) -> Optional[bool]:
         """Implement"""
@@ -0,0 +1,42 @@
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ComponentMetrics:
+    """
+    Базовый класс метрик компонента.
+    Метрики - обычные счётчики в полях dataclass-а, компонент обновляет их на месте.
+    as_dict() отдаёт снимок в едином для всех компонентов формате.
+    """
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин (в секундах для задержек).
+    counts[i] - число значений <= buckets[i], последний элемент counts - значения больше всех границ.
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+__all__ = ("ComponentMetrics", "Histogram", "DEFAULT_LATENCY_BUCKETS")
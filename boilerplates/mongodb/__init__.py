@@ -1,7 +1,19 @@
 from boilerplates._utils import optional_dependency
 
 with optional_dependency("mongodb"):
-    from .config import MongoConfig
+    from .config import Compressor, MongoConfig, ReadPreferenceMode
+    from .lease import MongoLeaseBackend
+    from .monitoring import CommandMetrics, MongoCommandListener, MongoMetrics, MongoPoolListener
     from .wrapper import MongoDBWrapper
 
-__all__ = ("MongoConfig", "MongoDBWrapper")
+__all__ = (
+    "CommandMetrics",
+    "Compressor",
+    "MongoCommandListener",
+    "MongoConfig",
+    "MongoDBWrapper",
+    "MongoLeaseBackend",
+    "MongoMetrics",
+    "MongoPoolListener",
+    "ReadPreferenceMode",
+)
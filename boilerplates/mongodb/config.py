@@ -1,6 +1,37 @@
+from enum import auto, unique
 from typing import Optional
 
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel, Field, SecretStr
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+from boilerplates.enums import LowerStringEnum
+
+
+@unique
+class Compressor(LowerStringEnum):
+    # snappy и zstd требуют пакетов python-snappy и zstandard (backports.zstd для новых pymongo)
+    ZSTD = auto()
+    SNAPPY = auto()
+    ZLIB = auto()
+
+
+@unique
+class ReadPreferenceMode(LowerStringEnum):
+    PRIMARY = auto()
+    PRIMARY_PREFERRED = auto()
+    SECONDARY = auto()
+    SECONDARY_PREFERRED = auto()
+    NEAREST = auto()
+
+
+ReadPreference = Primary | PrimaryPreferred | Secondary | SecondaryPreferred | Nearest
+
+_READ_PREFERENCES = {
+    ReadPreferenceMode.PRIMARY_PREFERRED: PrimaryPreferred,
+    ReadPreferenceMode.SECONDARY: Secondary,
+    ReadPreferenceMode.SECONDARY_PREFERRED: SecondaryPreferred,
+    ReadPreferenceMode.NEAREST: Nearest,
+}
 
 
 class MongoConfig(BaseModel):
@@ -12,6 +43,38 @@ class MongoConfig(BaseModel):
     min_connections_count: int
     max_connections_count: int
     custom_auth_source: Optional[str] = None
+    # Метрики команд и пула соединений в MongoDBWrapper.metrics
+    monitoring_enabled: bool = False
+    # Команды не быстрее порога пишутся в лог, None - не логировать (работает при monitoring_enabled)
+    slow_command_threshold_ms: Optional[int] = None
+    # Параметры клиента ниже со значением None не передаются в клиент, и действуют параметры из host
+    # (например, ?compressors=zlib&readPreference=secondaryPreferred) или значения по умолчанию pymongo.
+    # Сжатие трафика, сервер выбирает первый из поддерживаемых им алгоритмов списка
+    compressors: Optional[list[Compressor]] = None
+    # Уровень сжатия zlib от -1 до 9
+    zlib_compression_level: Optional[int] = Field(default=None, ge=-1, le=9)
+    # Простаивающие дольше соединения закрываются
+    max_idle_time_ms: Optional[int] = None
+    # Сколько соединений пул может устанавливать одновременно
+    max_connecting: Optional[int] = Field(default=None, gt=0)
+    read_preference: Optional[ReadPreferenceMode] = None
+    # Максимальное отставание вторичной реплики для чтения, не меньше 90 секунд; None - без ограничения.
+    # Применяется вместе с read_preference
+    max_staleness_seconds: Optional[int] = Field(default=None, ge=90)
+
+    def get_read_preference(self, mode: Optional[ReadPreferenceMode] = None) -> Optional[ReadPreference]:
+        """
+        Read preference для mode (по умолчанию - из конфига) с учётом max_staleness_seconds.
+        None, если ни mode, ни read_preference конфига не заданы.
+        """
+        mode = mode or self.read_preference
+        if mode is None:
+            return None
+
+        if mode == ReadPreferenceMode.PRIMARY:
+            return Primary()
+
+        return _READ_PREFERENCES[mode](max_staleness=self.max_staleness_seconds or -1)
 
     @property
     def as_dsn(self) -> str:
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pymongo.errors import DuplicateKeyError
+
+from boilerplates.lease import LeaseBackend
+from boilerplates.mongodb.wrapper import MongoDBWrapper
+
+
+class MongoLeaseBackend(LeaseBackend):
+    """
+    Лизы в коллекции MongoDB.
+    Документ лиза: {_id: key, owner, expires_at}. Истёкшие документы удаляет TTL-индекс.
+    Время берётся с часов реплики, поэтому ttl должен заметно превышать рассинхрон часов.
+    """
+
+    def __init__(
+        self,
+        mongo: MongoDBWrapper,
+        logger: Any,
+        collection_name: str = "scheduler_leases",
+        owner: str | None = None,
+    ) -> None:
+        super().__init__(logger, owner)
+        self._collection = mongo.get_db()[collection_name]
+        self._is_index_created = False
+
+    async def acquire(self, key: str, ttl: timedelta) -> bool:
+        await self._ensure_index()
+        now = datetime.now(timezone.utc)
+        try:
+            # Существующий неистёкший лиз не попадёт под фильтр, и upsert упадёт на уникальности _id
+            await self._collection.update_one(
+                {"_id": key, "expires_at": {"$lte": now}},
+                {"$set": {"owner": self.owner, "expires_at": now + ttl}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+
+        return True
+
+    async def renew(self, key: str, ttl: timedelta) -> bool:
+        result = await self._collection.update_one(
+            {"_id": key, "owner": self.owner},
+            {"$set": {"expires_at": datetime.now(timezone.utc) + ttl}},
+        )
+        return result.matched_count == 1
+
+    async def release(self, key: str, hold_until: datetime | None = None) -> None:
+        now = datetime.now(timezone.utc)
+        await self._collection.update_one(
+            {"_id": key, "owner": self.owner},
+            {"$set": {"expires_at": max(hold_until, now) if hold_until else now}},
+        )
+
+    async def _ensure_index(self) -> None:
+        if not self._is_index_created:
+            await self._collection.create_index("expires_at", expireAfterSeconds=0)
+            self._is_index_created = True
@@ -0,0 +1,143 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymongo import monitoring
+
+from boilerplates.metrics import ComponentMetrics, Histogram
+
+# Команды, у которых имя коллекции лежит не в значении имени команды
+_COLLECTION_KEYS = {"getMore": "collection"}
+_NO_COLLECTION = "-"
+
+
+@dataclass
+class CommandMetrics(ComponentMetrics):
+    count: int = 0
+    errors: int = 0
+    slow: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+
+@dataclass
+class MongoMetrics(ComponentMetrics):
+    # Ключ - "<коллекция>.<команда>", для команд без коллекции (ping, hello, ...) - "-.<команда>"
+    commands: dict[str, CommandMetrics] = field(default_factory=dict)
+    connections_created: int = 0
+    connections_closed: int = 0
+    checkouts: int = 0
+    checkout_errors: int = 0
+    checkout_wait: Histogram = field(default_factory=Histogram)
+
+
+def _get_collection(command_name: str, command: Any) -> str:
+    collection = command.get(_COLLECTION_KEYS.get(command_name, command_name))
+    return collection if isinstance(collection, str) else _NO_COLLECTION
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Метрики команд MongoDB по парам (коллекция, команда) и лог медленных команд.
+    Команды длительностью от slow_command_threshold_ms пишутся в лог warning-ом
+    без тела команды, чтобы не логировать данные документов.
+
+    pymongo вызывает слушатели синхронно в потоках Motor, поэтому обработчики событий
+    не обращаются к event loop и только обновляют счётчики под блокировкой.
+    """
+
+    def __init__(self, logger: Any, metrics: MongoMetrics, slow_command_threshold_ms: int | None = None) -> None:
+        self._logger = logger
+        self._metrics = metrics
+        self._slow_threshold_micros = (
+            slow_command_threshold_ms * 1000 if slow_command_threshold_ms is not None else None
+        )
+        # Коллекция известна только в событии начала команды
+        self._collections: dict[tuple[Any, int], str] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._collections[event.connection_id, event.request_id] = _get_collection(event.command_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finished(event, failed=True)
+
+    def _finished(self, event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent, failed: bool) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), _NO_COLLECTION)
+        key = f"{collection}.{event.command_name}"
+        is_slow = self._slow_threshold_micros is not None and event.duration_micros >= self._slow_threshold_micros
+        with self._lock:
+            command_metrics = self._metrics.commands.get(key)
+            if command_metrics is None:
+                command_metrics = self._metrics.commands[key] = CommandMetrics()
+
+            command_metrics.count += 1
+            command_metrics.latency.observe(event.duration_micros / 1_000_000)
+            if failed:
+                command_metrics.errors += 1
+
+            if is_slow:
+                command_metrics.slow += 1
+
+        if is_slow:
+            self._logger.warning(
+                "Медленная команда MongoDB",
+                database=event.database_name,
+                collection=collection,
+                command=event.command_name,
+                duration_ms=event.duration_micros / 1000,
+                failed=failed,
+            )
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Метрики пула соединений: ожидание выдачи соединения из пула, созданные и закрытые соединения"""
+
+    def __init__(self, metrics: MongoMetrics) -> None:
+        self._metrics = metrics
+        # События приходят из потоков Motor и фоновых потоков pymongo
+        self._lock = threading.Lock()
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        with self._lock:
+            self._metrics.checkouts += 1
+            self._metrics.checkout_wait.observe(event.duration)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self._metrics.checkout_errors += 1
+            self._metrics.checkout_wait.observe(event.duration)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._metrics.connections_created += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self._metrics.connections_closed += 1
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        ...
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        ...
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        ...
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        ...
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        ...
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        ...
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        ...
+
+
+__all__ = ("CommandMetrics", "MongoCommandListener", "MongoMetrics", "MongoPoolListener")
@@ -1,6 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 from boilerplates.mongodb.config import MongoConfig
+from boilerplates.mongodb.monitoring import MongoCommandListener, MongoMetrics, MongoPoolListener
 
 
 class MongoDBWrapper:
@@ -11,12 +12,32 @@ class MongoDBWrapper:
     ) -> None:
         self._logger = logger
         self._config = config
+        self.metrics = MongoMetrics()
+        event_listeners = []
+        if self._config.monitoring_enabled:
+            event_listeners = [
+                MongoCommandListener(logger, self.metrics, self._config.slow_command_threshold_ms),
+                MongoPoolListener(self.metrics),
+            ]
+
+        # Параметры клиента переопределяют параметры из DSN, поэтому передаются только заданные в конфиге
+        options = {
+            "maxIdleTimeMS": self._config.max_idle_time_ms,
+            "maxConnecting": self._config.max_connecting,
+            "zlibCompressionLevel": self._config.zlib_compression_level,
+            "read_preference": self._config.get_read_preference(),
+        }
+        if self._config.compressors is not None:
+            options["compressors"] = [compressor.value for compressor in self._config.compressors]
+
         self.client = AsyncIOMotorClient(
             self._config.as_dsn,
             minPoolSize=self._config.min_connections_count,
             maxPoolSize=self._config.max_connections_count,
             timeoutMS=self._config.timeout_ms,
             uuidRepresentation="standard",
+            event_listeners=event_listeners,
+            **{name: value for name, value in options.items() if value is not None},
         )
 
     async def on_startup(self) -> None:
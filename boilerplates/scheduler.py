@@ -1,8 +1,18 @@
 import asyncio
+import os
+import time
 from collections.abc import AsyncGenerator, Awaitable, Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import AsyncExitStack, asynccontextmanager
-from datetime import timedelta
-from typing import Any, Generic, TypeVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import auto, unique
+from functools import partial
+from typing import Any, ClassVar, Generic, TypeVar
+
+from boilerplates.enums import LowerStringEnum
+from boilerplates.lease import LeaseBackend
+from boilerplates.metrics import ComponentMetrics
 
 Context = TypeVar("Context")
 
@@ -79,6 +89,103 @@ class BaseTask(Generic[Context]):
         return RepeatedTask(interval=interval, coro=self.run, logger=self.logger)
 
 
+@unique
+class ExecutorKind(LowerStringEnum):
+    THREAD = auto()
+    PROCESS = auto()
+
+
+@dataclass
+class ExecutorTaskMetrics(ComponentMetrics):
+    in_flight: int = 0
+    queue_depth: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+class ExecutorTask(BaseTask[Context]):
+    """
+    Вариант BaseTask для CPU-bound задач.
+    Бизнес-логика - в синхронном execute_sync(), который выполняется в пуле потоков или процессов,
+    не блокируя event loop. run(), get_max_duration() и Scheduler.call() работают как у BaseTask.
+    По таймауту отменяется только ожидание: уже начатый execute_sync доработает в пуле.
+
+    Пул задаётся через executor_kind/max_workers или передаётся готовым (например, общий на несколько задач).
+    Собственный пул создаётся при первом запуске и закрывается через shutdown_executor().
+    Для ExecutorKind.PROCESS execute_sync должен быть staticmethod, а аргументы - сериализуемыми pickle.
+    """
+
+    executor_kind: ClassVar[ExecutorKind] = ExecutorKind.THREAD
+    max_workers: ClassVar[int | None] = None
+
+    def __init__(self, context: Context, logger: Any, executor: Executor | None = None) -> None:
+        super().__init__(context, logger)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.metrics = ExecutorTaskMetrics()
+
+    def execute_sync(self, *args, **kwargs) -> None:
+        raise NotImplementedError()
+
+    async def execute(self, *args, **kwargs) -> None:
+        loop = asyncio.get_running_loop()
+        future = self._get_executor().submit(partial(self.execute_sync, *args, **kwargs))
+        self._update_in_flight(1)
+        # Колбэк вешается на future пула: при таймауте отменяется только ожидание,
+        # а вызов занимает воркер пула, пока не завершится
+        future.add_done_callback(partial(self._on_done_threadsafe, loop))
+        await asyncio.wrap_future(future)
+
+    def shutdown_executor(self, wait: bool = True) -> None:
+        if self._executor and self._owns_executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            match self.executor_kind:
+                case ExecutorKind.THREAD:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+                case ExecutorKind.PROCESS:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                case _:
+                    raise ValueError(f"Unsupported executor_kind value: {self.executor_kind}")
+
+        return self._executor
+
+    def _get_pool_size(self) -> int:
+        # Размер переданного готового пула не связан с max_workers задачи
+        pool_size = getattr(self._executor, "_max_workers", None)
+        if pool_size:
+            return pool_size
+
+        if self.max_workers:
+            return self.max_workers
+
+        # Значения по умолчанию concurrent.futures
+        cpu_count = os.cpu_count() or 1
+        return cpu_count if self.executor_kind == ExecutorKind.PROCESS else min(32, cpu_count + 4)
+
+    def _update_in_flight(self, delta: int) -> None:
+        self.metrics.in_flight += delta
+        self.metrics.queue_depth = max(0, self.metrics.in_flight - self._get_pool_size())
+
+    def _on_done_threadsafe(self, loop: asyncio.AbstractEventLoop, future: Future) -> None:
+        # Вызывается в потоке пула, метрики обновляются в потоке event loop-а
+        try:
+            loop.call_soon_threadsafe(self._on_done, future)
+        except RuntimeError:
+            # Event loop уже закрыт
+            pass
+
+    def _on_done(self, future: Future) -> None:
+        self._update_in_flight(-1)
+        if future.cancelled() or future.exception():
+            self.metrics.failed += 1
+        else:
+            self.metrics.completed += 1
+
+
 class Scheduler:
     """
     Запускает задачи по расписанию.
@@ -87,12 +194,24 @@ class Scheduler:
     Перед вызовом use все задачи должны быть добавлены через register().
     Если кроме фоновых задач в приложении ничего нет,
     можно воспользоваться методом wait() в качестве основного.
+
+    При нескольких репликах можно передать lease_backend: время делится на тики
+    длиной в интервал задачи, и перед запуском по расписанию захватывается лиз
+    на (task.name, tick). Так каждый тик выполняется не более чем одной репликой.
+    Вызов через call() лизы не использует.
     """
 
-    def __init__(self, logger: Any) -> None:
+    def __init__(
+        self,
+        logger: Any,
+        lease_backend: LeaseBackend | None = None,
+        lease_ttl: timedelta = timedelta(seconds=30),
+    ) -> None:
         self.tasks: dict[str, BaseTask] = {}
         self.logger = logger
         self.wait_list: list[asyncio.Task] = []
+        self.lease_backend = lease_backend
+        self._lease_ttl = lease_ttl
 
     def register(self, task: BaseTask) -> None:
         self.tasks[task.name] = task
@@ -114,12 +233,35 @@ class Scheduler:
         async with AsyncExitStack() as stack:
             for task_name, interval in schedule.items():
                 if task := self._get_task(task_name):
-                    repeated_task = task.at_schedule(interval)
+                    repeated_task = self._at_schedule(task, interval)
                     await stack.enter_async_context(repeated_task)
                     if aio_task := repeated_task.task:
                         self.wait_list.append(aio_task)
 
             yield self
 
+    def _at_schedule(self, task: BaseTask, interval: timedelta) -> RepeatedTask:
+        if not self.lease_backend:
+            return task.at_schedule(interval)
+
+        return RepeatedTask(
+            interval=interval,
+            coro=partial(self._run_with_lease, self.lease_backend, task, interval),
+            logger=self.logger,
+        )
+
+    async def _run_with_lease(self, lease_backend: LeaseBackend, task: BaseTask, interval: timedelta) -> None:
+        seconds = interval.total_seconds()
+        tick = int(time.time() // seconds)
+        # Ключ держим до конца тика, чтобы опоздавшая реплика не запустила задачу повторно
+        tick_end = datetime.fromtimestamp((tick + 1) * seconds, tz=timezone.utc)
+
+        async with lease_backend.hold(f"{task.name}:{tick}", ttl=self._lease_ttl, hold_until=tick_end) as acquired:
+            if not acquired:
+                self.logger.debug(f"Task {task.name} tick {tick} is run by another replica")
+                return
+
+            await task.run()
+
     async def wait(self) -> None:
         await asyncio.wait(self.wait_list)
@@ -1,7 +1,11 @@
+from typing import Any, Optional
+
 from pydantic import BaseModel
 
 from boilerplates._utils import optional_dependency
 
+from .sampling import TokenBucket, TracesSampler, TracesSamplerMetrics, TracesSamplingRule
+
 with optional_dependency("sentry"):
     import sentry_sdk
     from sentry_sdk.integrations import Integration
@@ -11,23 +15,58 @@ class SentrySettings(BaseModel):
     dsn: str
     is_enabled: bool
     environment: str
+    # Доля транзакций, не подходящих ни под одно из traces_sampling_rules
     traces_sample_rate: float = 0.0
+    # Правила по именам транзакций, применяется первое подходящее
+    traces_sampling_rules: list[TracesSamplingRule] = []
+    # Не больше стольких записанных транзакций в секунду на процесс, None - без ограничения
+    traces_per_second: Optional[float] = None
+    # Транзакции не быстрее порога отправляются всегда (из записанных по record_rate правил)
+    traces_slow_threshold_ms: Optional[int] = None
     max_value_length: int = 1024
 
 
-def setup_sentry(settings: SentrySettings, app_version: str, integrations: list[Integration] | None = None) -> None:
+def setup_sentry(
+    settings: SentrySettings,
+    app_version: str,
+    integrations: list[Integration] | None = None,
+) -> TracesSampler | None:
+    """
+    Инициализирует Sentry. Если заданы правила семплирования или лимит traces_per_second,
+    транзакции семплирует TracesSampler, он возвращается для доступа к метрикам.
+    Иначе используется traces_sample_rate без накладных расходов на вызов семплера.
+    """
     if not integrations:
         integrations = []
 
+    sampler = None
+    sampling_options: dict[str, Any] = {"traces_sample_rate": settings.traces_sample_rate}
+    if settings.traces_sampling_rules or settings.traces_per_second:
+        sampler = TracesSampler(
+            settings.traces_sampling_rules,
+            settings.traces_sample_rate,
+            traces_per_second=settings.traces_per_second,
+            slow_threshold_ms=settings.traces_slow_threshold_ms,
+        )
+        sampling_options = {"traces_sampler": sampler, "before_send_transaction": sampler.before_send_transaction}
+
     sentry_sdk.init(
         dsn=settings.dsn,
         environment=settings.environment,
         release=app_version,
-        traces_sample_rate=settings.traces_sample_rate,
         integrations=integrations,
         default_integrations=False,
         max_value_length=settings.max_value_length,
+        **sampling_options,
     )
+    return sampler
 
 
-__all__ = ("setup_sentry", "SentrySettings")
+__all__ = (
+    "setup_sentry",
+    "SentrySettings",
+    "TokenBucket",
+    "TracesSampler",
+    "TracesSamplerMetrics",
+    "TracesSamplingRule",
+)
@@ -0,0 +1,188 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import Any, Optional
+
+from pydantic import BaseModel, model_validator
+
+from boilerplates.metrics import ComponentMetrics
+
+# Статусы транзакций, которые считаются ошибками сервиса (клиентские ошибки вроде not_found - нет)
+_ERROR_STATUSES = frozenset(
+    {"internal_error", "unknown_error", "unknown", "unavailable", "data_loss", "deadline_exceeded", "unimplemented"},
+)
+_MAX_CACHED_NAMES = 1024
+# Транзакции, не дошедшие до отправки (например, незавершённые), не должны копиться бесконечно
+_MAX_TAIL_CANDIDATES = 10_000
+
+
+class TracesSamplingRule(BaseModel):
+    """
+    Правило семплирования транзакций с именем, подходящим под glob-шаблон name (например, "GET /api/v1/items*").
+    sample_rate - доля отправляемых в Sentry транзакций.
+    record_rate - доля транзакций, которые записываются (с накладными расходами трейсинга), по умолчанию
+    равна sample_rate. Если record_rate больше, из записанных транзакций ошибки и медленные отправляются всегда,
+    а остальные - с вероятностью sample_rate / record_rate, так что обычных транзакций по-прежнему sample_rate.
+    """
+
+    name: str
+    sample_rate: float
+    record_rate: Optional[float] = None
+
+    @model_validator(mode="after")
+    def _check_rates(self) -> "TracesSamplingRule":
+        if self.record_rate is None:
+            self.record_rate = self.sample_rate
+
+        if not 0 <= self.sample_rate <= self.record_rate <= 1:
+            raise ValueError("0 <= sample_rate <= record_rate <= 1 is required")
+
+        return self
+
+
+@dataclass
+class TracesSamplerMetrics(ComponentMetrics):
+    recorded: int = 0
+    not_sampled: int = 0
+    # Не записаны из-за превышения traces_per_second
+    over_budget: int = 0
+    sent: int = 0
+    kept_errors: int = 0
+    kept_slow: int = 0
+    dropped: int = 0
+
+
+class TokenBucket:
+    """
+    Ограничение частоты: rate токенов в секунду, не больше capacity (по умолчанию max(1, rate)) накопленных.
+    Потокобезопасен: Sentry вызывает семплер из потоков, в которых начинаются транзакции.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self._rate = rate
+        self._capacity = capacity or max(1.0, rate)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
+
+
+def _to_timestamp(value: Any) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+
+    if isinstance(value, datetime):
+        return value.timestamp()
+
+    return float(value)
+
+
+class TracesSampler:
+    """
+    traces_sampler и before_send_transaction для sentry_sdk.init, построенные по правилам.
+
+    traces_sampler (__call__) решает, записывать ли транзакцию:
+    продолжение чужой трассы следует решению родителя, иначе транзакция записывается с record_rate первого
+    подходящего правила (traces_sample_rate, если правил нет), но не чаще traces_per_second в секунду.
+    before_send_transaction отбрасывает лишние обычные транзакции, записанные этим семплером по правилу
+    с record_rate > sample_rate, оставляя ошибки и транзакции не быстрее slow_threshold_ms.
+    Такие транзакции запоминаются по span_id в момент записи, поэтому хвостовой фильтр применяет правило,
+    выбранное по исходному имени, даже если интеграция потом переименовала транзакцию (url -> route),
+    и не трогает продолжения чужих трасс, решение о которых принял родитель.
+    """
+
+    def __init__(
+        self,
+        rules: list[TracesSamplingRule],
+        default_rate: float,
+        traces_per_second: float | None = None,
+        slow_threshold_ms: int | None = None,
+    ) -> None:
+        self._rules = rules
+        self._default_rule = TracesSamplingRule(name="*", sample_rate=default_rate)
+        self._rules_by_name: dict[str, TracesSamplingRule] = {}
+        self._tail_candidates: OrderedDict[str, TracesSamplingRule] = OrderedDict()
+        self._tail_candidates_lock = threading.Lock()
+        self._bucket = TokenBucket(traces_per_second) if traces_per_second else None
+        self._slow_threshold = slow_threshold_ms / 1000 if slow_threshold_ms is not None else None
+        self.metrics = TracesSamplerMetrics()
+
+    def __call__(self, sampling_context: dict[str, Any]) -> float:
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return float(parent_sampled)
+
+        transaction_context = sampling_context["transaction_context"]
+        rule = self._get_rule(transaction_context.get("name") or "")
+        if not rule.record_rate or random.random() >= rule.record_rate:
+            self.metrics.not_sampled += 1
+            return 0.0
+
+        if self._bucket is not None and not self._bucket.try_acquire():
+            self.metrics.over_budget += 1
+            return 0.0
+
+        # Решение уже принято с учётом доли правила
+        self.metrics.recorded += 1
+        if rule.sample_rate != rule.record_rate and (span_id := transaction_context.get("span_id")):
+            with self._tail_candidates_lock:
+                self._tail_candidates[span_id] = rule
+                if len(self._tail_candidates) > _MAX_TAIL_CANDIDATES:
+                    self._tail_candidates.popitem(last=False)
+
+        return 1.0
+
+    def before_send_transaction(self, event: dict[str, Any], hint: dict[str, Any]) -> dict[str, Any] | None:
+        trace = event.get("contexts", {}).get("trace", {})
+        with self._tail_candidates_lock:
+            rule = self._tail_candidates.pop(trace.get("span_id"), None)
+
+        if rule is None:
+            self.metrics.sent += 1
+            return event
+
+        if trace.get("status") in _ERROR_STATUSES:
+            self.metrics.kept_errors += 1
+        elif self._is_slow(event):
+            self.metrics.kept_slow += 1
+        elif random.random() >= rule.sample_rate / rule.record_rate:  # type: ignore[operator]
+            self.metrics.dropped += 1
+            return None
+
+        self.metrics.sent += 1
+        return event
+
+    def _get_rule(self, name: str) -> TracesSamplingRule:
+        rule = self._rules_by_name.get(name)
+        if rule is None:
+            rule = next((rule for rule in self._rules if fnmatchcase(name, rule.name)), self._default_rule)
+            # Имена транзакций обычно - шаблоны маршрутов, но с неудачной интеграцией могут содержать id
+            if len(self._rules_by_name) >= _MAX_CACHED_NAMES:
+                self._rules_by_name.clear()
+
+            self._rules_by_name[name] = rule
+
+        return rule
+
+    def _is_slow(self, event: dict[str, Any]) -> bool:
+        if self._slow_threshold is None or "timestamp" not in event or "start_timestamp" not in event:
+            return False
+
+        return _to_timestamp(event["timestamp"]) - _to_timestamp(event["start_timestamp"]) >= self._slow_threshold
+
+
+__all__ = ("TokenBucket", "TracesSampler", "TracesSamplerMetrics", "TracesSamplingRule")
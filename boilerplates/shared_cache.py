@@ -0,0 +1,324 @@
+import asyncio
+import fcntl
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Awaitable, Callable, Generator, Hashable
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from boilerplates.cache import CacheMetrics
+from boilerplates.storage import StorageConfig
+
+_MAGIC = b"BPSHMC01"
+# magic, число слотов, размер слота
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+_SEQ = struct.Struct("<Q")
+# хэш ключа, момент истечения (time.time()), длина ключа, длина значения
+_SLOT_HEADER = struct.Struct("<QdII")
+_SLOT_DATA_OFFSET = _SEQ.size + _SLOT_HEADER.size
+# Счётчик и заголовок слота одним чтением
+_SLOT = struct.Struct("<QQdII")
+# Сколько соседних слотов может занимать ключ
+_PROBES = 4
+_MAX_READ_RETRIES = 100
+_MISSING: Any = object()
+# Блокировки записи внутри процесса по пути файла: POSIX-блокировки lockf не разделяют
+# ни потоки, ни несколько экземпляров кэша одного процесса
+_process_locks: dict[str, threading.Lock] = {}
+_process_locks_guard = threading.Lock()
+
+
+@dataclass
+class SharedCacheMetrics(CacheMetrics):
+    # Значения, не поместившиеся в слот и поэтому не сохранённые
+    oversized: int = 0
+    # Повторные чтения слота, совпавшие с записью другого процесса
+    read_retries: int = 0
+
+
+def _default_directory() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _encode_key(key: Hashable) -> tuple[bytes, int]:
+    # hash() рандомизирован в каждом процессе, поэтому хэш считается от repr ключа.
+    # Коллизии crc32 безопасны: ключ слота сравнивается целиком. 0 - хэш пустого слота
+    data = repr(key).encode()
+    return data, zlib.crc32(data) or 1
+
+
+class SharedMemoryCache:
+    """
+    Кэш в разделяемой памяти для процессов одного хоста (например, нескольких Celery-воркеров).
+    Данные лежат в файле directory/name (по умолчанию в /dev/shm), отображённом в память каждого процесса,
+    поэтому значения хранятся на хосте в одном экземпляре, а не в копии на каждый процесс.
+
+    Файл состоит из config.cache_max_size слотов по slot_size байт. Ключ занимает один из _PROBES слотов,
+    следующих за его хэшем; если все они заняты, вытесняется значение, истекающее раньше остальных.
+    Значения сериализуются pickle и должны помещаться в слот вместе с ключом, большие значения не кэшируются.
+    Ключи - значения со стабильным repr: str, int, кортежи из них.
+
+    Чтение не блокируется: каждый слот защищён seqlock-ом (счётчик нечётный, пока идёт запись,
+    и меняется после неё), и читатель повторяет чтение, если слот изменился во время чтения.
+    Записи упорядочиваются POSIX-блокировкой fcntl.lockf на файле между процессами и threading.Lock
+    внутри процесса. В отличие от flock, lockf принадлежит процессу, а не открытому файлу, поэтому исключает
+    и воркеры, форкнутые после создания кэша и унаследовавшие его дескриптор.
+
+    Если процесс-писатель убит посреди записи, счётчик слота остаётся нечётным и читатели считают слот
+    промахом. Такие слоты очищаются при открытии кэша и при следующей записи в слот.
+
+    Файл создаётся с правами 0600: значения читаются через pickle, поэтому писать в кэш должны только
+    доверенные процессы того же пользователя. Процессы с разными slot_size или cache_max_size файл не разделяют.
+
+    Пример использования:
+        ```python
+        cache = SharedMemoryCache("currencies", StorageConfig(cache_max_size=10_000, cache_ttl=timedelta(minutes=5)))
+        rates = await cache.get_or_load(("rates", "USD"), lambda: load_rates("USD"))
+        ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: StorageConfig,
+        slot_size: int = 1024,
+        directory: str | None = None,
+    ) -> None:
+        if slot_size <= _SLOT_DATA_OFFSET:
+            raise ValueError(f"slot_size must be greater than {_SLOT_DATA_OFFSET}")
+
+        self.path = os.path.join(directory or _default_directory(), name)
+        self._slots = config.cache_max_size
+        self._slot_size = slot_size
+        self._probes = min(_PROBES, self._slots)
+        self._ttl = config.cache_ttl.total_seconds()
+        self._loading: dict[Hashable, asyncio.Task[Any]] = {}
+        with _process_locks_guard:
+            self._thread_lock = _process_locks.setdefault(os.path.realpath(self.path), threading.Lock())
+
+        self.metrics = SharedCacheMetrics()
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = _HEADER_SIZE + self._slots * slot_size
+        with self._write_lock():
+            if os.fstat(self._fd).st_size == 0:
+                # Новый файл заполнен нулями: все слоты пустые
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, self._slots, slot_size), 0)
+
+            magic, slots, stored_slot_size = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+            is_valid = (magic, slots, stored_slot_size) == (_MAGIC, self._slots, slot_size)
+            if is_valid:
+                self._memory = mmap.mmap(self._fd, size)
+                self._view = memoryview(self._memory)
+                self._repair_interrupted_writes()
+
+        if not is_valid:
+            os.close(self._fd)
+            raise ValueError(f"{self.path} has another layout: {slots} slots of {stored_slot_size} bytes")
+
+    def close(self) -> None:
+        """Закрыть отображение, файл и данные в нём остаются для других процессов"""
+        self._view.release()
+        self._memory.close()
+        # Закрытие любого дескриптора файла снимает все lockf-блокировки процесса на нём,
+        # поэтому ждём окончания записи других экземпляров кэша этого процесса
+        with self._thread_lock:
+            os.close(self._fd)
+
+    def unlink(self) -> None:
+        """Удалить файл кэша, процессы, открывшие его раньше, продолжат работать со своей копией"""
+        os.unlink(self.path)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._read(*_encode_key(key))
+        if value is _MISSING:
+            self.metrics.misses += 1
+            return default
+
+        self.metrics.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> bool:
+        """Сохранить значение, False - значение не помещается в слот"""
+        key_data, key_hash = _encode_key(key)
+        value_data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if _SLOT_DATA_OFFSET + len(key_data) + len(value_data) > self._slot_size:
+            self.metrics.oversized += 1
+            return False
+
+        with self._write_lock():
+            offset = self._find_slot_for_write(key_data, key_hash)
+            self._write(offset, key_hash, time.time() + self._ttl, key_data, value_data)
+
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        self.metrics.invalidations += 1
+        key_data, key_hash = _encode_key(key)
+        with self._write_lock():
+            for offset in self._probe(key_hash):
+                if self._has_key(offset, key_data, key_hash):
+                    self._write(offset, 0, 0.0, b"", b"")
+
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        with self._write_lock():
+            for slot in range(self._slots):
+                offset = _HEADER_SIZE + slot * self._slot_size
+                if _SLOT_HEADER.unpack_from(self._memory, offset + _SEQ.size)[0]:
+                    self.metrics.invalidations += 1
+                    self._write(offset, 0, 0.0, b"", b"")
+
+        self._loading.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Значение из кэша или результат loader-а, сохранённый в кэш.
+        Одновременные промахи схлопываются в одну загрузку только внутри процесса.
+        """
+        value = self._read(*_encode_key(key))
+        if value is not _MISSING:
+            self.metrics.hits += 1
+            return value
+
+        self.metrics.misses += 1
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = asyncio.create_task(self._load(key, loader))
+
+        # shield: отмена одного из ожидающих не должна отменять общую загрузку
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        self.metrics.loads += 1
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+        except BaseException:
+            self.metrics.load_errors += 1
+            raise
+        else:
+            if self._loading.get(key) is task:
+                self.set(key, value)
+
+            return value
+        finally:
+            if self._loading.get(key) is task:
+                del self._loading[key]
+
+    def _probe(self, key_hash: int) -> list[int]:
+        return [
+            _HEADER_SIZE + (key_hash + index) % self._slots * self._slot_size
+            for index in range(self._probes)
+        ]
+
+    def _read(self, key_data: bytes, key_hash: int) -> Any:
+        slots, slot_size = self._slots, self._slot_size
+        for index in range(self._probes):
+            value = self._read_slot(_HEADER_SIZE + (key_hash + index) % slots * slot_size, key_data, key_hash)
+            if value is not _MISSING:
+                return value
+
+        return _MISSING
+
+    def _read_slot(self, offset: int, key_data: bytes, key_hash: int) -> Any:
+        memory = self._memory
+        for _ in range(_MAX_READ_RETRIES):
+            seq, slot_hash, expires_at, key_length, value_length = _SLOT.unpack_from(memory, offset)
+            if seq & 1:
+                self.metrics.read_retries += 1
+                continue
+
+            if slot_hash != key_hash:
+                # Слот другого ключа: даже если его сейчас перезаписывают, наш ключ в нём не появится
+                return _MISSING
+
+            value = _MISSING
+            is_expired = False
+            data_offset = offset + _SLOT_DATA_OFFSET
+            value_offset = data_offset + key_length
+            # Срез mmap - копия нескольких байт ключа, сравнение среза memoryview заметно медленнее
+            if memory[data_offset:value_offset] == key_data:
+                if expires_at <= time.time():
+                    is_expired = True
+                else:
+                    try:
+                        value = pickle.loads(self._view[value_offset:value_offset + value_length])
+                    except Exception:  # pylint: disable=broad-except
+                        # Данные могли быть перезаписаны во время чтения, это покажет проверка счётчика
+                        value = _MISSING
+
+            if _SEQ.unpack_from(memory, offset)[0] == seq:
+                if is_expired:
+                    self.metrics.expirations += 1
+
+                return value
+
+            self.metrics.read_retries += 1
+
+        # Слот постоянно перезаписывается, считаем промахом
+        return _MISSING
+
+    def _has_key(self, offset: int, key_data: bytes, key_hash: int) -> bool:
+        slot_hash, _, key_length, _ = _SLOT_HEADER.unpack_from(self._memory, offset + _SEQ.size)
+        data_offset = offset + _SLOT_DATA_OFFSET
+        return slot_hash == key_hash and self._view[data_offset:data_offset + key_length] == key_data
+
+    def _find_slot_for_write(self, key_data: bytes, key_hash: int) -> int:
+        """Слот с тем же ключом, иначе пустой или истёкший, иначе истекающий раньше других. Под блокировкой"""
+        offsets = self._probe(key_hash)
+        for offset in offsets:
+            if self._has_key(offset, key_data, key_hash):
+                return offset
+
+        now = time.time()
+        earliest_offset, earliest_expires_at = offsets[0], float("inf")
+        for offset in offsets:
+            slot_hash, expires_at, _, _ = _SLOT_HEADER.unpack_from(self._memory, offset + _SEQ.size)
+            if not slot_hash or expires_at <= now:
+                return offset
+
+            if expires_at < earliest_expires_at:
+                earliest_offset, earliest_expires_at = offset, expires_at
+
+        self.metrics.evictions += 1
+        return earliest_offset
+
+    def _write(self, offset: int, key_hash: int, expires_at: float, key_data: bytes, value_data: bytes) -> None:
+        """Запись слота по протоколу seqlock, вызывается под блокировкой"""
+        # Под блокировкой нечётный счётчик остаётся только от убитого писателя, | 1 восстанавливает чётность
+        seq = _SEQ.unpack_from(self._memory, offset)[0] | 1
+        _SEQ.pack_into(self._memory, offset, seq)
+        _SLOT_HEADER.pack_into(self._memory, offset + _SEQ.size, key_hash, expires_at, len(key_data), len(value_data))
+        data_offset = offset + _SLOT_DATA_OFFSET
+        self._memory[data_offset:data_offset + len(key_data) + len(value_data)] = key_data + value_data
+        _SEQ.pack_into(self._memory, offset, seq + 1)
+
+    def _repair_interrupted_writes(self) -> None:
+        """Очистить слоты, запись в которые прервалась вместе с процессом-писателем. Под блокировкой"""
+        for slot in range(self._slots):
+            offset = _HEADER_SIZE + slot * self._slot_size
+            if _SEQ.unpack_from(self._memory, offset)[0] & 1:
+                self._write(offset, 0, 0.0, b"", b"")
+
+    @contextmanager
+    def _write_lock(self) -> Generator[None, None, None]:
+        with self._thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+
+__all__ = ("SharedCacheMetrics", "SharedMemoryCache")
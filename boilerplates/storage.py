@@ -6,3 +6,5 @@ from pydantic import BaseModel
 class StorageConfig(BaseModel):
     cache_max_size: int
     cache_ttl: timedelta
+    # Сколько после истечения cache_ttl отдавать устаревшее значение, обновляя его в фоне (stale-while-revalidate)
+    cache_stale_ttl: timedelta = timedelta(0)
@@ -1,9 +1,17 @@
-from .config import MongoConfig
+from .bulk import BulkOperationResult, BulkWriter, BulkWriterConfig, BulkWriterMetrics
+from .config import MongoConfig, SchemaSyncMode
 from .db import Mongo
 from .models import DBModel
+from .schema import schema_fingerprint
 
 __all__ = [
+    "BulkOperationResult",
+    "BulkWriter",
+    "BulkWriterConfig",
+    "BulkWriterMetrics",
     "DBModel",
     "Mongo",
     "MongoConfig",
+    "SchemaSyncMode",
+    "schema_fingerprint",
 ]
@@ -0,0 +1,274 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from boilerplates.metrics import ComponentMetrics, Histogram
+from pydantic import BaseModel, Field, ValidationError
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, WriteError
+from structlog.types import FilteringBoundLogger
+
+from .models import DBModel
+
+_WriteRequest = InsertOne | ReplaceOne | UpdateOne | UpdateMany | DeleteOne | DeleteMany
+
+
+class BulkWriterConfig(BaseModel):
+    max_batch_size: int = Field(
+        default=1000,
+        gt=0,
+        description="A collection buffer is flushed when it reaches this size",
+    )
+    flush_interval: timedelta = Field(
+        default=timedelta(milliseconds=200),
+        description="Buffers are flushed at least this often",
+    )
+    max_pending: int = Field(
+        default=10_000,
+        gt=0,
+        description="Maximum number of buffered and in-flight operations, callers wait when it is reached",
+    )
+
+
+@dataclass
+class BulkOperationResult:
+    inserted_id: Any = None
+    upserted_id: Any = None
+
+
+@dataclass
+class BulkWriterMetrics(ComponentMetrics):
+    buffered: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    batch_latency: Histogram = field(default_factory=Histogram)
+
+
+@dataclass
+class _PendingOperation:
+    model: type[DBModel]
+    request: _WriteRequest
+    future: "asyncio.Future[BulkOperationResult]"
+    document: DBModel | None = None
+    # The inserted dict, pymongo sets its _id on insert
+    inserted: dict[str, Any] | None = None
+    filter_: dict[str, Any] | None = None
+
+
+@dataclass
+class _CollectionBuffer:
+    collection: Any
+    operations: list[_PendingOperation] = field(default_factory=list)
+
+
+class BulkWriter:
+    """
+    Buffers write operations per collection and writes them as unordered bulk_write batches.
+
+    A buffer is flushed when it reaches max_batch_size operations or every flush_interval.
+    Every method returns a future with the result of the operation: BulkOperationResult or the WriteError
+    of this operation. Awaiting the future is optional.
+    When max_pending operations are buffered or in flight, the methods wait until some of them are written.
+
+    Documents are written as is: beanie event actions, validation on save and revision checks are not applied.
+
+    Example:
+        ```python
+        writer = mongo.create_bulk_writer(BulkWriterConfig(max_batch_size=500))
+        for item in items:
+            await writer.insert(Item(**item))
+
+        await writer.flush()
+        ```
+    """
+
+    def __init__(self, logger: FilteringBoundLogger, config: BulkWriterConfig | None = None) -> None:
+        self._logger = logger
+        self._config = config or BulkWriterConfig()
+        self._buffers: dict[str, _CollectionBuffer] = {}
+        self._slots = asyncio.Semaphore(self._config.max_pending)
+        self._writes: set[asyncio.Task[None]] = set()
+        self._flusher: asyncio.Task[None] | None = None
+        self._is_closed = False
+        self.metrics = BulkWriterMetrics()
+
+    async def insert(self, document: DBModel) -> "asyncio.Future[BulkOperationResult]":
+        bson = document.to_bson()
+        return await self._add(type(document), InsertOne(bson), document=document, inserted=bson)
+
+    async def upsert(self, document: DBModel) -> "asyncio.Future[BulkOperationResult]":
+        """Replace the document by its id or insert it"""
+        if document.id is None:
+            raise ValueError("Document id is required for upsert")
+
+        bson = document.to_bson()
+        return await self._add(type(document), ReplaceOne({"_id": bson["_id"]}, bson, upsert=True), document=document)
+
+    async def update(
+        self,
+        model: type[DBModel],
+        filter_: dict[str, Any],
+        update: dict[str, Any] | list[dict[str, Any]],
+        upsert: bool = False,
+        many: bool = False,
+    ) -> "asyncio.Future[BulkOperationResult]":
+        request_cls = UpdateMany if many else UpdateOne
+        return await self._add(model, request_cls(filter_, update, upsert=upsert), filter_=filter_)
+
+    async def delete(
+        self,
+        model: type[DBModel],
+        filter_: dict[str, Any],
+        many: bool = False,
+    ) -> "asyncio.Future[BulkOperationResult]":
+        request_cls = DeleteMany if many else DeleteOne
+        return await self._add(model, request_cls(filter_), filter_=filter_)
+
+    async def flush(self) -> None:
+        """Write all buffered operations and wait for the writes in flight"""
+        for name in list(self._buffers):
+            self._flush_collection(name)
+
+        while self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Write all buffered operations and stop the background flush, new operations are rejected"""
+        self._is_closed = True
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
+
+        await self.flush()
+
+    async def _add(
+        self,
+        model: type[DBModel],
+        request: _WriteRequest,
+        document: DBModel | None = None,
+        inserted: dict[str, Any] | None = None,
+        filter_: dict[str, Any] | None = None,
+    ) -> "asyncio.Future[BulkOperationResult]":
+        if self._is_closed:
+            raise RuntimeError("BulkWriter is closed")
+
+        await self._slots.acquire()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+        name = model.get_collection_name()
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            buffer = self._buffers[name] = _CollectionBuffer(collection=model.get_motor_collection())
+
+        future: asyncio.Future[BulkOperationResult] = asyncio.get_running_loop().create_future()
+        buffer.operations.append(_PendingOperation(model, request, future, document, inserted, filter_))
+        self.metrics.buffered += 1
+        if len(buffer.operations) >= self._config.max_batch_size:
+            self._flush_collection(name)
+
+        return future
+
+    async def _flush_periodically(self) -> None:
+        interval = self._config.flush_interval.total_seconds()
+        while True:
+            await asyncio.sleep(interval)
+            for name in list(self._buffers):
+                self._flush_collection(name)
+
+    def _flush_collection(self, name: str) -> None:
+        buffer = self._buffers.get(name)
+        if buffer is None or not buffer.operations:
+            return
+
+        batch, buffer.operations = buffer.operations, []
+        task = asyncio.create_task(self._write(buffer.collection, batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, collection: Any, batch: list[_PendingOperation]) -> None:
+        started_at = time.monotonic()
+        try:
+            result = await collection.bulk_write([operation.request for operation in batch], ordered=False)
+        except BulkWriteError as exc:
+            self._logger.warning(
+                f"Bulk write to {collection.name}: {len(exc.details.get('writeErrors', []))} of {len(batch)} failed",
+            )
+            self._resolve_failed(batch, exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._logger.error(f"Bulk write to {collection.name} failed: {exc!r}")
+            for operation in batch:
+                self._set_exception(operation, exc)
+        else:
+            upserted_ids = result.upserted_ids or {}
+            for index, operation in enumerate(batch):
+                self._set_result(operation, upserted_ids.get(index))
+        finally:
+            self.metrics.buffered -= len(batch)
+            self.metrics.batches += 1
+            self.metrics.batch_latency.observe(time.monotonic() - started_at)
+            for _ in batch:
+                self._slots.release()
+
+            _invalidate_cache(batch)
+
+    def _resolve_failed(self, batch: list[_PendingOperation], exc: BulkWriteError) -> None:
+        details = exc.details
+        errors = {error["index"]: error for error in details.get("writeErrors", [])}
+        upserted_ids = {upserted["index"]: upserted["_id"] for upserted in details.get("upserted", [])}
+        # A write concern error is not bound to an operation, so none of them can be considered written
+        batch_error = exc if details.get("writeConcernErrors") else None
+        for index, operation in enumerate(batch):
+            if error := errors.get(index):
+                self._set_exception(operation, WriteError(error.get("errmsg"), error.get("code"), error))
+            elif batch_error:
+                self._set_exception(operation, batch_error)
+            else:
+                self._set_result(operation, upserted_ids.get(index))
+
+    def _set_result(self, operation: _PendingOperation, upserted_id: Any) -> None:
+        self.metrics.written += 1
+        inserted_id = None
+        if operation.inserted is not None:
+            inserted_id = operation.inserted["_id"]
+            if operation.document is not None and operation.document.id is None:
+                operation.document.id = inserted_id
+
+        if not operation.future.done():
+            operation.future.set_result(BulkOperationResult(inserted_id=inserted_id, upserted_id=upserted_id))
+
+    def _set_exception(self, operation: _PendingOperation, exc: Exception) -> None:
+        self.metrics.failed += 1
+        if not operation.future.done():
+            operation.future.set_exception(exc)
+            # The caller may not await the future, the error is already counted and reported
+            operation.future.exception()
+
+
+def _invalidate_cache(batch: list[_PendingOperation]) -> None:
+    for operation in batch:
+        if (cache := operation.model.get_model_cache()) is None:
+            continue
+
+        if operation.document is not None:
+            cache.invalidate(operation.document)
+        elif operation.filter_ and not isinstance(document_id := operation.filter_.get("_id"), (dict, type(None))):
+            try:
+                cache.invalidate_id(document_id)
+            except ValidationError:
+                # The id is not of the model id type, it cannot be matched with a cache key
+                cache.clear()
+        else:
+            # The affected documents are unknown
+            cache.clear()
+
+
+__all__ = (
+    "BulkOperationResult",
+    "BulkWriter",
+    "BulkWriterConfig",
+    "BulkWriterMetrics",
+)
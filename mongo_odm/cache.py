@@ -0,0 +1,101 @@
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+from boilerplates.cache import AsyncTTLCache, CacheMetrics
+from boilerplates.storage import StorageConfig
+
+if TYPE_CHECKING:
+    from .models import DBModel
+
+_ID_KEY = "_id"
+
+
+class ModelCache:
+    """
+    Read-through cache of one DBModel: documents by id and by unique fields.
+
+    Keys are (field, value) pairs. A cached document is also reachable by its id in a reverse index,
+    so a write that knows only the id (e.g. a delete) invalidates its unique-field keys too.
+    Found and not found (None) results are cached, readers get copies of the cached documents.
+    """
+
+    def __init__(self, model: "type[DBModel]", config: StorageConfig, unique_fields: tuple[str, ...] = ()) -> None:
+        self._model = model
+        self._unique_fields = unique_fields
+        self._keys_by_id: dict[Any, set[Hashable]] = {}
+        self._cache: AsyncTTLCache[DBModel | None] = AsyncTTLCache(config, on_evict=self._on_evict)
+
+    @property
+    def metrics(self) -> CacheMetrics:
+        return self._cache.metrics
+
+    def normalize_id(self, document_id: Any) -> Any:
+        """Convert the id to the id field type, so e.g. str and ObjectId ids share a key"""
+        return self._model.normalize_id(document_id)
+
+    async def get(
+        self,
+        document_id: Any,
+        loader: "Callable[[], Awaitable[DBModel | None]]",
+    ) -> "DBModel | None":
+        document = await self._cache.get_or_load((_ID_KEY, self.normalize_id(document_id)), loader)
+        return _copy(document)
+
+    async def get_by(
+        self,
+        field: str,
+        value: Hashable,
+        loader: "Callable[[], Awaitable[DBModel | None]]",
+    ) -> "DBModel | None":
+        """Cached only for unique fields, other fields are read by the loader on every call"""
+        if field not in self._unique_fields:
+            return await loader()
+
+        key = (field, value)
+
+        async def load() -> "DBModel | None":
+            document = await loader()
+            if document is not None:
+                self._keys_by_id.setdefault(document.id, set()).add(key)
+
+            return document
+
+        return _copy(await self._cache.get_or_load(key, load))
+
+    def invalidate(self, document: "DBModel") -> None:
+        """Invalidate the document by its id and by the current values of its unique fields"""
+        if document.id is not None:
+            self.invalidate_id(document.id)
+
+        for field in self._unique_fields:
+            value = getattr(document, field, None)
+            if isinstance(value, Hashable):
+                self._cache.invalidate((field, value))
+
+    def invalidate_id(self, document_id: Any) -> None:
+        document_id = self.normalize_id(document_id)
+        self._cache.invalidate((_ID_KEY, document_id))
+        # Unique field values may have been changed by the write, so the keys are taken from the reverse index
+        for key in self._keys_by_id.pop(document_id, ()):
+            self._cache.invalidate(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._keys_by_id.clear()
+
+    def _on_evict(self, key: Hashable, document: "DBModel | None") -> None:
+        if document is None or key[0] == _ID_KEY:  # type: ignore[index]
+            return
+
+        if (keys := self._keys_by_id.get(document.id)) is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[document.id]
+
+
+def _copy(document: "DBModel | None") -> "DBModel | None":
+    # Callers may modify the returned document, the cached one must stay intact
+    return document.model_copy(deep=True) if document is not None else None
+
+
+__all__ = ("ModelCache",)
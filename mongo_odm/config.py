@@ -1,5 +1,20 @@
+from enum import auto, unique
+
+from boilerplates.enums import LowerStringEnum
 from boilerplates.mongodb import MongoConfig as Base
 
 
+@unique
+class SchemaSyncMode(LowerStringEnum):
+    # Create indexes and recreate views on every startup
+    ALWAYS = auto()
+    # Only when the schema fingerprint differs from the one stored in the database
+    ON_CHANGE = auto()
+    # Never, for read-only replicas: views that do not exist are still created
+    NEVER = auto()
+
+
 class MongoConfig(Base):
     allow_index_dropping: bool = False
+    schema_sync: SchemaSyncMode = SchemaSyncMode.ALWAYS
+    schema_metadata_collection: str = "schema_metadata"
@@ -1,16 +1,23 @@
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Mapping, Sequence
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import Any, Self
 
 from beanie import Document, View, init_beanie
 from boilerplates.logging import get_logger
-from boilerplates.mongodb import MongoDBWrapper
+from boilerplates.mongodb import MongoDBWrapper, ReadPreferenceMode
 from bson.binary import UuidRepresentation
 from bson.codec_options import CodecOptions
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 from structlog.types import FilteringBoundLogger
 
-from .config import MongoConfig
+from .bulk import BulkWriter, BulkWriterConfig
+from .config import MongoConfig, SchemaSyncMode
+from .scan import parallel_scan_collection, scan_collection
+from .schema import schema_fingerprint
+
+_SCHEMA_METADATA_ID = "beanie"
 
 
 class Mongo(MongoDBWrapper):
@@ -27,14 +34,64 @@ class Mongo(MongoDBWrapper):
             "recreate_views": True,
             "allow_index_dropping": config.allow_index_dropping,
         }
+        self._bulk_writers: list[BulkWriter] = []
+        self.startup_duration: float | None = None
 
     async def startup(self) -> None:
-        await init_beanie(database=self.get_db(), **self._beanie_options)
+        started_at = time.monotonic()
+        await self._init_beanie()
         await self.startup_event_handler()
+        self.startup_duration = time.monotonic() - started_at
+        self._logger.debug("Mongo started", duration=round(self.startup_duration, 3))
+
+    async def _init_beanie(self) -> None:
+        """
+        Initialize beanie, creating indexes and views according to config.schema_sync.
+        With ON_CHANGE the fingerprint of the models is kept in config.schema_metadata_collection,
+        and the schema is synchronized only by the first process started with changed models.
+        """
+        db = self.get_db()
+        mode = self._config.schema_sync
+        fingerprint = None
+        if mode == SchemaSyncMode.ON_CHANGE:
+            fingerprint = schema_fingerprint(
+                self._beanie_options["document_models"],
+                self._beanie_options["allow_index_dropping"],
+            )
+            stored = await db[self._config.schema_metadata_collection].find_one({"_id": _SCHEMA_METADATA_ID})
+            if stored is not None and stored.get("fingerprint") == fingerprint:
+                mode = SchemaSyncMode.NEVER
+
+        if mode == SchemaSyncMode.NEVER:
+            # Models are still bound to their collections, views that do not exist yet are created
+            await init_beanie(database=db, **{**self._beanie_options, "recreate_views": False, "skip_indexes": True})
+            self._logger.debug("Mongo schema synchronization skipped", schema_sync=self._config.schema_sync)
+            return
+
+        await init_beanie(database=db, **self._beanie_options)
+        self._logger.info("Mongo schema synchronized", schema_sync=self._config.schema_sync)
+        if fingerprint is not None:
+            # Written after a successful synchronization, so a failed one is repeated by the next start
+            await db[self._config.schema_metadata_collection].update_one(
+                {"_id": _SCHEMA_METADATA_ID},
+                {"$set": {"fingerprint": fingerprint, "updated_at": datetime.now(timezone.utc)}},
+                upsert=True,
+            )
 
     async def shutdown(self) -> None:
+        # Buffered writes are finished before the client is closed
+        for writer in self._bulk_writers:
+            await writer.close()
+
+        self._bulk_writers.clear()
         await self.shutdown_event_handler()
 
+    def create_bulk_writer(self, config: BulkWriterConfig | None = None) -> BulkWriter:
+        """Create a BulkWriter whose buffers are written on shutdown"""
+        writer = BulkWriter(self._logger, config)
+        self._bulk_writers.append(writer)
+        return writer
+
     @asynccontextmanager
     async def use(self) -> AsyncGenerator[Self, None]:
         try:
@@ -43,11 +100,79 @@ class Mongo(MongoDBWrapper):
         finally:
             await self.shutdown()
 
-    def get_db(self) -> "AsyncIOMotorDatabase[Any]":
+    def get_db(self, read_preference: ReadPreferenceMode | None = None) -> "AsyncIOMotorDatabase[Any]":
+        """The database, read_preference overrides config.read_preference for its reads"""
         return self.client.get_database(
             self._config.db_name,
             codec_options=CodecOptions(
                 uuid_representation=UuidRepresentation.STANDARD,
                 tz_aware=True,
             ),
+            read_preference=self._config.get_read_preference(read_preference) if read_preference else None,
+        )
+
+    def get_collection(
+        self,
+        source: type[Document] | str,
+        read_preference: ReadPreferenceMode | None = None,
+    ) -> "AsyncIOMotorCollection[Any]":
+        """The collection of a model or a collection name, e.g. to run heavy reads on secondaries:
+
+        Usage:
+            ```python
+            collection = mongo.get_collection(Order, ReadPreferenceMode.SECONDARY_PREFERRED)
+            totals = await collection.aggregate(pipeline).to_list(None)
+            ```
+        """
+        if isinstance(source, str):
+            return self.get_db(read_preference)[source]
+
+        collection = source.get_motor_collection()
+        if read_preference:
+            collection = collection.with_options(read_preference=self._config.get_read_preference(read_preference))
+
+        return collection
+
+    def scan(
+        self,
+        source: type[Document] | str,
+        filter_: Mapping[str, Any] | None = None,
+        fields: Sequence[str] | None = None,
+        batch_size: int = 1000,
+        as_tuples: bool = False,
+        read_preference: ReadPreferenceMode | None = None,
+    ) -> AsyncGenerator[list[Any], None]:
+        """Stream the documents of a model or a collection name as batches of raw dicts or tuples.
+
+        Usage:
+            ```python
+            async for batch in mongo.scan(User, fields=["_id", "email"], as_tuples=True):
+                ...
+            ```
+        """
+        return scan_collection(self.get_collection(source, read_preference), filter_, fields, batch_size, as_tuples)
+
+    def parallel_scan(  # pylint: disable=too-many-arguments
+        self,
+        source: type[Document] | str,
+        concurrency: int,
+        filter_: Mapping[str, Any] | None = None,
+        fields: Sequence[str] | None = None,
+        batch_size: int = 1000,
+        as_tuples: bool = False,
+        max_buffered_batches: int | None = None,
+        read_preference: ReadPreferenceMode | None = None,
+    ) -> AsyncGenerator[list[Any], None]:
+        """The same as scan, but _id ranges of the collection are read by `concurrency` cursors.
+
+        See parallel_scan_collection for details.
+        """
+        return parallel_scan_collection(
+            self.get_collection(source, read_preference),
+            concurrency,
+            filter_=filter_,
+            fields=fields,
+            batch_size=batch_size,
+            as_tuples=as_tuples,
+            max_buffered_batches=max_buffered_batches,
         )
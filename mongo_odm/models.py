@@ -1,8 +1,150 @@
-from typing import Any
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Any, ClassVar, Self
 
 from beanie import Document
+from boilerplates.storage import StorageConfig
+from pydantic import TypeAdapter
+
+from .cache import ModelCache
+
+_model_caches: dict[type["DBModel"], ModelCache] = {}
+_id_adapters: dict[type["DBModel"], TypeAdapter[Any]] = {}
 
 
 class DBModel(Document):
+    """
+    Base document model.
+
+    Set cache_config to enable the read-through cache of `get` and `get_by` for the model.
+    The cache is invalidated by writes made through the document methods and BulkWriter,
+    writes made by queries (e.g. `find(...).update(...)`) or by other services are seen after cache_ttl.
+    """
+
+    cache_config: ClassVar[StorageConfig | None] = None
+    cache_unique_fields: ClassVar[tuple[str, ...]] = ()
+
     def to_bson(self) -> dict[str, Any]:
-        return self.model_dump(by_alias=True, exclude_none=True)
+        """The same as model_dump(by_alias=True, exclude_none=True), calls the compiled serializer of the model"""
+        serializer = self.__pydantic_serializer__
+        return serializer.to_python(self, by_alias=True, exclude_none=True)  # type: ignore[no-any-return]
+
+    @classmethod
+    def from_bson(cls, data: Mapping[str, Any]) -> Self:
+        """
+        Build a document from data of the model collection by the compiled validator of the model.
+        Unlike beanie reads, links, inheritance (class_id) and lazy parsing are not handled.
+        Validation is kept: with pydantic 2 it is faster than model_construct().
+        """
+        document = cls.__pydantic_validator__.validate_python(data)
+        document._save_state()  # pylint: disable=protected-access
+        return document  # type: ignore[no-any-return]
+
+    @classmethod
+    async def find_trusted(
+        cls,
+        filter_: Mapping[str, Any],
+        sort: list[tuple[str, int]] | None = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> list[Self]:
+        """Find documents with the motor collection and build them with from_bson, for hot queries"""
+        cursor = cls.get_motor_collection().find(filter_, sort=sort, skip=skip, limit=limit)
+        return [cls.from_bson(data) async for data in cursor]
+
+    @classmethod
+    async def get_trusted(cls, document_id: Any) -> Self | None:
+        data = await cls.get_motor_collection().find_one({"_id": cls.normalize_id(document_id)})
+        return cls.from_bson(data) if data is not None else None
+
+    @classmethod
+    def normalize_id(cls, document_id: Any) -> Any:
+        """Convert the id to the id field type, e.g. a str to ObjectId"""
+        adapter = _id_adapters.get(cls)
+        if adapter is None:
+            adapter = _id_adapters[cls] = TypeAdapter(cls.model_fields["id"].annotation)
+
+        return adapter.validate_python(document_id)
+
+    @classmethod
+    def get_model_cache(cls) -> ModelCache | None:
+        """The cache of the model, None if the cache is disabled"""
+        cache = _model_caches.get(cls)
+        if cache is None and cls.cache_config is not None:
+            cache = _model_caches[cls] = ModelCache(cls, cls.cache_config, cls.cache_unique_fields)
+
+        return cache
+
+    @classmethod
+    async def get(  # type: ignore[override]
+        cls,
+        document_id: Any,
+        session: Any = None,
+        ignore_cache: bool = False,
+        **kwargs: Any,
+    ) -> Self | None:
+        cache = cls.get_model_cache()
+        if cache is None or ignore_cache or session is not None or any(kwargs.values()):
+            return await super().get(document_id, session=session, ignore_cache=ignore_cache, **kwargs)
+
+        parent = super()
+        return await cache.get(document_id, lambda: parent.get(document_id))  # type: ignore[return-value]
+
+    @classmethod
+    async def get_by(cls, field: str, value: Hashable) -> Self | None:
+        """Find a document by a unique field, cached if the field is in cache_unique_fields"""
+        cache = cls.get_model_cache()
+        if cache is None:
+            return await cls.find_one({field: value})
+
+        return await cache.get_by(field, value, lambda: cls.find_one({field: value}))  # type: ignore[return-value]
+
+    async def insert(self, **kwargs: Any) -> Self:
+        try:
+            return await super().insert(**kwargs)
+        finally:
+            self._invalidate_cache()
+
+    async def save(self, *args: Any, **kwargs: Any) -> Self:
+        try:
+            return await super().save(*args, **kwargs)
+        finally:
+            self._invalidate_cache()
+
+    async def replace(self, *args: Any, **kwargs: Any) -> Self:
+        try:
+            return await super().replace(*args, **kwargs)
+        finally:
+            self._invalidate_cache()
+
+    async def update(self, *args: Any, **kwargs: Any) -> Self:
+        try:
+            return await super().update(*args, **kwargs)
+        finally:
+            self._invalidate_cache()
+
+    async def delete(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await super().delete(*args, **kwargs)
+        finally:
+            self._invalidate_cache()
+
+    @classmethod
+    async def insert_many(cls, documents: Iterable[Self], *args: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        documents = list(documents)
+        try:
+            return await super().insert_many(documents, *args, **kwargs)
+        finally:
+            for document in documents:
+                document._invalidate_cache()
+
+    @classmethod
+    async def delete_all(cls, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await super().delete_all(*args, **kwargs)
+        finally:
+            if cache := cls.get_model_cache():
+                cache.clear()
+
+    def _invalidate_cache(self) -> None:
+        if cache := self.get_model_cache():
+            cache.invalidate(self)
@@ -0,0 +1,138 @@
+import asyncio
+from collections.abc import AsyncGenerator, Mapping, Sequence
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+# Number of sampled ids per partition, more samples give more even partitions
+_SAMPLES_PER_PARTITION = 20
+_DONE = object()
+
+
+def _to_tuples(batch: list[dict[str, Any]], fields: Sequence[str]) -> list[tuple[Any, ...]]:
+    return [tuple(document.get(field) for field in fields) for document in batch]
+
+
+async def scan_collection(
+    collection: "AsyncIOMotorCollection[Any]",
+    filter_: Mapping[str, Any] | None = None,
+    fields: Sequence[str] | None = None,
+    batch_size: int = 1000,
+    as_tuples: bool = False,
+) -> AsyncGenerator[list[Any], None]:
+    """
+    Read the documents matching the filter by batches of batch_size raw dicts.
+    fields limits the returned fields (projection), with as_tuples=True documents are returned as tuples
+    of the values of fields in the same order.
+    """
+    if as_tuples and not fields:
+        raise ValueError("fields are required for as_tuples")
+
+    projection = dict.fromkeys(fields, 1) if fields else None
+    cursor = collection.find(filter_ or {}, projection, batch_size=batch_size)
+    try:
+        while batch := await cursor.to_list(length=batch_size):
+            yield _to_tuples(batch, fields) if as_tuples else batch  # type: ignore[arg-type]
+    finally:
+        await cursor.close()
+
+
+async def split_id_ranges(
+    collection: "AsyncIOMotorCollection[Any]",
+    partitions: int,
+    filter_: Mapping[str, Any] | None = None,
+) -> list[tuple[Any, Any]]:
+    """
+    Split the collection into `partitions` ranges of _id with about the same number of documents,
+    using the quantiles of a random sample of ids. Range bounds are [lower, upper), None means no bound.
+    """
+    pipeline: list[dict[str, Any]] = []
+    if filter_:
+        pipeline.append({"$match": filter_})
+
+    pipeline += [{"$sample": {"size": partitions * _SAMPLES_PER_PARTITION}}, {"$project": {"_id": 1}}]
+    ids = sorted({document["_id"] async for document in collection.aggregate(pipeline)})
+    bounds = [ids[len(ids) * index // partitions] for index in range(1, partitions)] if ids else []
+    # Deduplicated bounds of a small sample may give fewer ranges than requested
+    bounds = sorted(set(bounds))
+    lower_bounds = [None, *bounds]
+    upper_bounds = [*bounds, None]
+    return list(zip(lower_bounds, upper_bounds))
+
+
+def _range_filter(filter_: Mapping[str, Any] | None, lower: Any, upper: Any) -> dict[str, Any]:
+    id_filter = {}
+    if lower is not None:
+        id_filter["$gte"] = lower
+
+    if upper is not None:
+        id_filter["$lt"] = upper
+
+    if not id_filter:
+        return dict(filter_ or {})
+
+    if not filter_:
+        return {"_id": id_filter}
+
+    return {"$and": [filter_, {"_id": id_filter}]}
+
+
+async def parallel_scan_collection(  # pylint: disable=too-many-arguments
+    collection: "AsyncIOMotorCollection[Any]",
+    concurrency: int,
+    filter_: Mapping[str, Any] | None = None,
+    fields: Sequence[str] | None = None,
+    batch_size: int = 1000,
+    as_tuples: bool = False,
+    max_buffered_batches: int | None = None,
+) -> AsyncGenerator[list[Any], None]:
+    """
+    The same as scan_collection, but the collection is split into `concurrency` _id ranges
+    read by concurrent cursors. Batches of different ranges come in arbitrary order.
+    At most max_buffered_batches (2 * concurrency by default) batches wait to be consumed, the cursors pause
+    when the consumer falls behind.
+
+    All _id values of the collection must be of one BSON type (e.g. ObjectId), because range queries
+    match only values of the type of their bounds.
+    """
+    ranges = await split_id_ranges(collection, concurrency, filter_)
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_buffered_batches or 2 * concurrency)
+
+    async def read_range(lower: Any, upper: Any) -> None:
+        try:
+            async for batch in scan_collection(
+                collection,
+                _range_filter(filter_, lower, upper),
+                fields=fields,
+                batch_size=batch_size,
+                as_tuples=as_tuples,
+            ):
+                await queue.put(batch)
+        except Exception as exc:  # pylint: disable=broad-except
+            await queue.put(exc)
+        else:
+            await queue.put(_DONE)
+
+    readers = [asyncio.create_task(read_range(lower, upper)) for lower, upper in ranges]
+    try:
+        running = len(readers)
+        while running:
+            item = await queue.get()
+            if item is _DONE:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for reader in readers:
+            reader.cancel()
+
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+__all__ = (
+    "parallel_scan_collection",
+    "scan_collection",
+    "split_id_ranges",
+)
@@ -0,0 +1,65 @@
+import hashlib
+import importlib
+import json
+from collections.abc import Sequence
+from typing import Any, get_args
+
+import beanie
+from beanie import Document, View
+
+# Settings that define collections, indexes and views, other settings do not need the schema to be synchronized
+_SCHEMA_SETTINGS = ("name", "indexes", "source", "pipeline", "is_root", "timeseries", "union_doc")
+
+
+def resolve_model(model: type[Document] | type[View] | str) -> type[Document] | type[View]:
+    """Import a model passed to init_beanie as a dotted path"""
+    if not isinstance(model, str):
+        return model
+
+    module_name, _, class_name = model.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)  # type: ignore[no-any-return]
+
+
+def _indexed_options(annotation: Any) -> Any:
+    """Options of beanie Indexed(...) type, also for Optional[Indexed(...)]"""
+    for candidate in (annotation, *get_args(annotation)):
+        if (indexed := getattr(candidate, "_indexed", None)) is not None:
+            return indexed
+
+    return None
+
+
+def _describe(model: type[Document] | type[View]) -> dict[str, Any]:
+    settings = getattr(model, "Settings", None)
+    return {
+        "model": f"{model.__module__}.{model.__qualname__}",
+        "kind": "view" if issubclass(model, View) else "document",
+        "settings": {
+            name: getattr(value, "__name__", value)
+            for name in _SCHEMA_SETTINGS
+            if (value := getattr(settings, name, None)) is not None
+        },
+        "indexed_fields": {
+            field.alias or name: indexed
+            for name, field in model.model_fields.items()
+            if (indexed := _indexed_options(field.annotation)) is not None
+        },
+    }
+
+
+def schema_fingerprint(models: Sequence[type[Document] | type[View] | str], allow_index_dropping: bool) -> str:
+    """
+    Hash of everything init_beanie creates in the database for the models: collection and view names,
+    indexes declared in Settings and by Indexed fields, view pipelines, and the beanie version.
+    """
+    description = {
+        "beanie": beanie.__version__,
+        "allow_index_dropping": allow_index_dropping,
+        "models": sorted((_describe(resolve_model(model)) for model in models), key=lambda item: item["model"]),
+    }
+    # repr of IndexModel and other values is stable between processes
+    data = json.dumps(description, sort_keys=True, default=repr)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+__all__ = ("resolve_model", "schema_fingerprint")